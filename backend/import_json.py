@@ -1,58 +1,310 @@
 #!/usr/bin/env python3
 """
 Script para importar dados do JSON para o Supabase
+
+Lê o arquivo de forma incremental (JSON Lines, como os arquivos de execução
+em backend/archive e failed_batches.jsonl, ou uma lista JSON de dumps
+antigos; ambos podem estar em .gz), valida
+cada registro e envia lotes por um pool limitado de threads, com novas
+tentativas e progresso. O deslocamento já importado fica em
+`<arquivo>.import-state.json`: rodar de novo continua de onde parou.
+
+Os registros são antigos: todos entram em price_history (sem a ingestão só
+de mudanças) e price_latest só avança com um registro mais novo que o
+last_seen gravado (ver ingestion.backfill_latest).
+
+Uso:
+    python import_json.py [arquivos...] [--workers 4] [--batch-size 500] [--restart]
+
+Sem arquivos, importa a execução mais recente em ARCHIVE_DIR (backend/archive).
 """
+import argparse
+import gzip
 import json
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 # Adicionar path do projeto
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from db import save_price_history
+from run_archive import META_TYPES, ARCHIVE_DIR, latest_archive
+
+READ_CHUNK = 64 * 1024
+
+# Segundos entre as linhas de progresso
+PROGRESS_INTERVAL = 5
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+def _iter_json_array(f, first_chunk):
+    """Elementos de uma lista JSON, sem carregar o arquivo inteiro."""
+    decoder = json.JSONDecoder()
+    buffer = first_chunk[first_chunk.index('[') + 1:]
+    pos = 0
+    eof = False
+
+    while True:
+        # Pular espaços e vírgulas entre os elementos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(READ_CHUNK), 0
+            eof = not buffer
+
+        if pos >= len(buffer):
+            raise ValueError("Lista JSON incompleta (falta ']')")
+        if buffer[pos] == ']':
+            return
 
-def import_json_to_supabase(json_file):
-    """Importa dados do JSON para o Supabase"""
-    
-    print(f"=== Importando {json_file} para Supabase ===\n")
-    
-    # Ler JSON
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    print(f"Total de produtos no JSON: {len(data)}\n")
-    
-    # Validar dados
-    valid_data = []
-    for item in data:
-        if item.get('price', 0) > 0 and item.get('product_name'):
-            valid_data.append(item)
-    
-    print(f"Produtos válidos (preço > 0): {len(valid_data)}\n")
-    
-    # Salvar no Supabase em lotes de 100
-    batch_size = 100
-    total_saved = 0
-    
-    for i in range(0, len(valid_data), batch_size):
-        batch = valid_data[i:i+batch_size]
-        print(f"Salvando lote {i//batch_size + 1} ({len(batch)} produtos)...")
-        
         try:
-            save_price_history(batch)
-            total_saved += len(batch)
-        except Exception as e:
-            print(f"Erro ao salvar lote: {e}")
+            item, end = decoder.raw_decode(buffer, pos)
+            # Um valor no fim do buffer pode estar cortado (ex: número)
+            if end == len(buffer) and not eof:
+                raise json.JSONDecodeError("fim do buffer", buffer, end)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = f.read(READ_CHUNK)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
             continue
-    
-    print(f"\n✅ Importação concluída!")
-    print(f"Total salvo: {total_saved}/{len(valid_data)} produtos")
+
+        yield item
+        pos = end
+        if pos > READ_CHUNK:
+            buffer, pos = buffer[pos:], 0
+
+def iter_records(path):
+    """
+    Registros de um arquivo JSON (lista) ou JSON Lines, um por vez.
+
+    Args:
+        path (str): Caminho do arquivo (.json, .jsonl, opcionalmente .gz)
+
+    Yields:
+        dict: Cada registro, na ordem do arquivo
+    """
+    with _open_text(path) as f:
+        first_chunk = f.read(READ_CHUNK)
+        if first_chunk.lstrip().startswith('['):
+            yield from _iter_json_array(f, first_chunk)
+            return
+
+        # JSON Lines: uma linha por registro
+        pending = first_chunk
+        while True:
+            *lines, pending = pending.split('\n')
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            pending += chunk
+        if pending.strip():
+            yield json.loads(pending)
+
+def validate_record(item):
+    """
+    Returns:
+        dict: Registro pronto para save_price_history, ou None se inválido
+    """
+    if not isinstance(item, dict) or not item.get('product_name') or not item.get('store'):
+        return None
+    try:
+        price = float(item.get('price') or 0)
+    except (TypeError, ValueError):
+        return None
+    if price <= 0:
+        return None
+    return {**item, 'product_name': item['product_name'].strip(), 'price': price}
+
+class ImportState:
+    """
+    Deslocamento já importado de um arquivo (índice do primeiro registro
+    ainda não confirmado). Os lotes terminam fora de ordem: o deslocamento
+    só avança até o primeiro lote ainda pendente.
+    """
+
+    def __init__(self, path, restart=False):
+        self.path = path
+        self.offset = 0
+        self._pending = {}   # índice inicial do lote -> índice final
+        self._done = {}
+        self._lock = threading.Lock()
+        if not restart and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.offset = json.load(f).get('offset', 0)
+
+    def started(self, start, end):
+        with self._lock:
+            self._pending[start] = end
+
+    def finished(self, start):
+        with self._lock:
+            self._done[start] = self._pending.pop(start)
+            while self.offset in self._done:
+                self.offset = self._done.pop(self.offset)
+            self._save()
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'offset': self.offset, 'updated_at': time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def _save_with_retry(batch, retries, backoff):
+    for attempt in range(1, retries + 1):
+        try:
+            # False: nada foi salvo (sem cliente Supabase), conta como falha
+            if save_price_history(batch, raise_errors=True, backfill=True) is False:
+                raise RuntimeError("cliente Supabase não configurado")
+            return
+        except Exception as e:
+            if attempt == retries:
+                raise
+            wait_seconds = backoff ** attempt
+            print(f"Erro ao salvar lote ({e}), nova tentativa em {wait_seconds:.0f}s...")
+            time.sleep(wait_seconds)
+
+def import_json_to_supabase(json_file, batch_size=500, workers=4, retries=3, backoff=2.0, restart=False):
+    """
+    Importa dados do JSON para o Supabase
+
+    Args:
+        json_file (str): Lista JSON ou JSON Lines (opcionalmente .gz)
+        batch_size (int): Registros por lote
+        workers (int): Lotes enviados em paralelo
+        retries (int): Tentativas por lote
+        backoff (float): Base do backoff exponencial (segundos)
+        restart (bool): Ignorar o deslocamento salvo e importar do início
+
+    Returns:
+        bool: True se todos os lotes foram salvos
+    """
+    print(f"=== Importando {json_file} para Supabase ===\n")
+
+    state = ImportState(json_file + '.import-state.json', restart=restart)
+    if state.offset:
+        print(f"Retomando a partir do registro {state.offset}.\n")
+
+    read = valid = saved = failed = 0
+    start_time = last_progress = time.monotonic()
+    def submit(executor, futures, batch, start, end):
+        state.started(start, end)
+        future = executor.submit(_save_with_retry, batch, retries, backoff)
+        futures[future] = (start, len(batch))
+
+    def collect(done, futures):
+        nonlocal saved, failed, last_progress
+        for future in done:
+            start, size = futures.pop(future)
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Lote a partir do registro {start} não salvo: {e}")
+                failed += size
+                continue
+            state.finished(start)
+            saved += size
+            now = time.monotonic()
+            if now - last_progress >= PROGRESS_INTERVAL:
+                last_progress = now
+                print(f"Progresso: {read} lidos, {saved} salvos ({saved / (now - start_time):.0f}/s)")
+
+    futures = {}
+    batch, batch_start = [], None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index, item in enumerate(iter_records(json_file)):
+            if index < state.offset:
+                continue
+            # O lote começa em qualquer linha, inclusive cabeçalho/rodapé: assim o
+            # deslocamento salvo passa por elas quando o lote termina
+            if batch_start is None:
+                batch_start = index
+            # Cabeçalho/rodapé dos arquivos de execução (run_archive.py)
+            if isinstance(item, dict) and item.get('type') in META_TYPES:
+                if item['type'] == 'run':
+                    print(f"Execução {item.get('run_id')} ({item.get('started_at')}): {len(item.get('queries') or [])} termos\n")
+                continue
+            read += 1
+
+            record = validate_record(item)
+            if record is not None:
+                valid += 1
+                batch.append(record)
+
+            if len(batch) >= batch_size:
+                # No máximo 2 lotes por worker em memória
+                while len(futures) >= workers * 2:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    collect(done, futures)
+                submit(executor, futures, batch, batch_start, index + 1)
+                batch, batch_start = [], None
+
+        if batch:
+            submit(executor, futures, batch, batch_start, index + 1)
+        elif batch_start is not None:
+            # Só registros inválidos ou o rodapé depois do último lote
+            state.started(batch_start, index + 1)
+            state.finished(batch_start)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            collect(done, futures)
+
+    elapsed = time.monotonic() - start_time
+    print(f"\nProdutos válidos (preço > 0): {valid} de {read} lidos")
+    if failed:
+        print(f"❌ {failed} produtos não foram salvos. Rode de novo para retomar de {state.offset}.")
+        return False
+
+    state.clear()
+    print(f"\n✅ Importação concluída em {elapsed:.0f}s!")
+    print(f"Total salvo: {saved}/{valid} produtos")
+    return True
 
 if __name__ == "__main__":
-    json_file = "dataset_multiloja_poc.json"
-    
-    if not os.path.exists(json_file):
-        print(f"❌ Arquivo {json_file} não encontrado!")
-        sys.exit(1)
-    
-    import_json_to_supabase(json_file)
+    parser = argparse.ArgumentParser(description="Importa dumps JSON / JSON Lines para o Supabase")
+    parser.add_argument("files", nargs="*",
+                        help="Arquivos a importar (padrão: a execução mais recente em ARCHIVE_DIR)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Registros por lote")
+    parser.add_argument("--workers", type=int, default=4, help="Lotes enviados em paralelo")
+    parser.add_argument("--retries", type=int, default=3, help="Tentativas por lote")
+    parser.add_argument("--restart", action="store_true", help="Ignorar o progresso salvo")
+    args = parser.parse_args()
+
+    if not args.files:
+        latest = latest_archive()
+        if latest is None:
+            print(f"❌ Nenhum arquivo de execução em {ARCHIVE_DIR}. Informe os arquivos a importar.")
+            sys.exit(1)
+        args.files = [latest]
+
+    ok = True
+    for json_file in args.files:
+        if not os.path.exists(json_file):
+            print(f"❌ Arquivo {json_file} não encontrado!")
+            sys.exit(1)
+        ok = import_json_to_supabase(
+            json_file,
+            batch_size=args.batch_size,
+            workers=max(1, args.workers),
+            retries=max(1, args.retries),
+            restart=args.restart
+        ) and ok
+
+    sys.exit(0 if ok else 1)
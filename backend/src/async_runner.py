@@ -0,0 +1,108 @@
+"""
+Orquestrador Concorrente
+
+Roda as lojas ao mesmo tempo (são domínios diferentes, não há motivo para uma
+esperar a outra), limitado pelo número de workers e pelo rate limit de cada
+loja (ver scheduler.py).
+
+Os scrapers usam a API sync do Playwright, então cada loja roda em um worker
+dedicado (BrowserWorkers) com o seu próprio Chromium, e o asyncio apenas
+coordena as tarefas. O isolamento de erros por loja é o mesmo do modo serial.
+"""
+
+import asyncio
+import os
+from browser_pool import BrowserWorkers
+from scheduler import build_jobs, run_jobs_async
+from db import save_price_history
+
+# Número padrão de lojas simultâneas (cada uma abre um contexto no seu worker)
+DEFAULT_CONCURRENCY = int(os.environ.get("SCRAPER_CONCURRENCY", "3"))
+
+async def run_all_scrapers_async(query="RTX 4060", workers=None, concurrency=DEFAULT_CONCURRENCY, limiter=None):
+    """
+    Versão concorrente de `run_all_scrapers`.
+
+    Args:
+        query (str): Termo de busca
+        workers (BrowserWorkers, optional): Workers compartilhados da execução.
+            Se não informado, são criados só para este termo.
+        concurrency (int): Lojas simultâneas quando `workers` não é informado
+        limiter (DomainRateLimiter, optional): Rate limit compartilhado entre termos
+
+    Returns:
+        list: Mesma lista de resultados do modo serial (na ordem das lojas)
+    """
+    print(f"=== Iniciando Scraping Multilojas (concorrente) para '{query}' ===")
+
+    own_workers = workers is None
+    if own_workers:
+        workers = BrowserWorkers(concurrency).start()
+
+    try:
+        job_results = await run_jobs_async(build_jobs([query]), workers, limiter)
+    finally:
+        if own_workers:
+            # shutdown() bloqueia até os navegadores fecharem
+            await asyncio.to_thread(workers.shutdown)
+
+    results = []
+    for store_data in job_results:
+        results.extend(store_data)
+
+    print(f"\n=== Finalizado. Total de produtos coletados: {len(results)} ===")
+
+    # Salvar no Banco de Dados
+    if results:
+        print("Salvando no Supabase...")
+        save_price_history(results)
+
+    return results
+
+async def run_sweep_async(queries, workers, limiter=None, writer=None):
+    """
+    Executa a matriz completa termos × lojas de uma vez.
+
+    Cada job é salvo no Supabase assim que termina, e as lojas em espera pelo
+    rate limit não seguram as demais (não há pausa global entre termos).
+
+    Args:
+        queries (list): Termos de busca
+        workers (BrowserWorkers): Workers com navegador próprio
+        limiter (DomainRateLimiter, optional): Rate limit por loja
+        writer (ResultWriter, optional): Recebe os produtos de cada job; neles
+            a varredura não é mantida em memória
+
+    Returns:
+        list: Todos os produtos, na ordem termo → loja (vazia com `writer`)
+    """
+    jobs = build_jobs(queries)
+    print(f"=== Agendando {len(jobs)} jobs ({len(queries)} termos × lojas) ===")
+
+    if writer is not None:
+        loop = asyncio.get_running_loop()
+
+        async def push_job(job, store_data):
+            if store_data:
+                # put bloqueia com a fila cheia: esperar fora do event loop
+                # (só a fila desta loja aguarda, as demais seguem)
+                await loop.run_in_executor(None, writer.put, store_data)
+
+        await run_jobs_async(jobs, workers, limiter, on_result=push_job, keep_results=False)
+        return []
+
+    loop = asyncio.get_running_loop()
+    pending_saves = []
+
+    def save_job(job, store_data):
+        if store_data:
+            # save_price_history faz I/O de rede: não bloquear o event loop
+            pending_saves.append(loop.run_in_executor(None, save_price_history, store_data))
+
+    job_results = await run_jobs_async(jobs, workers, limiter, on_result=save_job)
+    await asyncio.gather(*pending_saves)
+
+    results = []
+    for store_data in job_results:
+        results.extend(store_data)
+    return results
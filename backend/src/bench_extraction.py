@@ -0,0 +1,239 @@
+"""
+Benchmark da Extração sobre Snapshots Salvos
+
+Roda a extração de cada loja (seletores de scrapers/specs.py + `engine.parse_cards`),
+o `is_valid_pc_product` e o `normalize_product_name` sobre as páginas gravadas
+com SCRAPER_SNAPSHOT_MODE=record, sem acessar as lojas.
+
+Para cada loja informa cartões/segundo, tempo por etapa e pico de memória, e
+grava o resultado em JSON para comparar execuções:
+
+    python backend/src/bench_extraction.py --output bench.json
+    python backend/src/bench_extraction.py --compare bench.json --threshold 0.2
+
+Com --compare, sai com código 1 se alguma loja ficou mais lenta que o limite.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from product_filter import is_valid_pc_product
+from product_normalizer import ProductNormalizer
+from scrapers.engine import parse_cards
+from scrapers.fast_path import parse_cards_html
+from scrapers.snapshots import SNAPSHOT_DIR, EXECUTABLE_SCRIPT_RE, slugify
+from scrapers.specs import SPECS_BY_NAME
+
+STAGES = ["extract", "parse", "filter", "normalize"]
+
+def load_corpus(snapshot_dir=SNAPSHOT_DIR, stores=None):
+    """
+    Lê as páginas renderizadas salvas pelo modo record.
+
+    Returns:
+        dict: {loja: [(termo, arquivo, html), ...]}
+    """
+    corpus = {}
+    for store_name in SPECS_BY_NAME:
+        if stores and store_name not in stores:
+            continue
+        pattern = os.path.join(snapshot_dir, slugify(store_name), "*", "page-*.html")
+        for path in sorted(glob.glob(pattern)):
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read()
+            query = os.path.basename(os.path.dirname(path))
+            corpus.setdefault(store_name, []).append((query, os.path.basename(path), html))
+    return corpus
+
+def _browser_extractor(pool):
+    """Extração pelo mesmo JS do navegador (page.set_content + extract_cards)."""
+    from scrapers.extraction import extract_cards
+
+    context = pool.new_context()
+    page = context.new_page()
+
+    def extract(html, spec):
+        page.set_content(EXECUTABLE_SCRIPT_RE.sub("", html), wait_until="domcontentloaded")
+        return extract_cards(page, spec)
+
+    return extract, context
+
+def run_once(store_name, pages, extract):
+    """
+    Uma passada completa de uma loja sobre o corpus.
+
+    Returns:
+        tuple: (tempos por etapa em segundos, cartões, produtos)
+    """
+    spec = SPECS_BY_NAME[store_name]
+    # Normalizador novo a cada passada: mede o custo com o cache LRU vazio
+    normalizer = ProductNormalizer()
+    timings = dict.fromkeys(STAGES, 0.0)
+    cards_total = 0
+    products_total = 0
+
+    for _, _, html in pages:
+        start = time.perf_counter()
+        cards = extract(html, spec["card"])
+        timings["extract"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        products = parse_cards(spec, cards)
+        timings["parse"] += time.perf_counter() - start
+
+        # Filtro isolado sobre todos os títulos (o parse_cards da maioria das
+        # lojas também filtra; aqui medimos o custo do filtro sozinho)
+        titles = [card["title"] for card in cards if card.get("title")]
+        start = time.perf_counter()
+        for title in titles:
+            is_valid_pc_product(title)
+        timings["filter"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        normalizer.normalize_many(product["product_name"] for product in products)
+        timings["normalize"] += time.perf_counter() - start
+
+        cards_total += len(cards)
+        products_total += len(products)
+
+    return timings, cards_total, products_total
+
+def bench_store(store_name, pages, extract, repeat=5):
+    """
+    Mede uma loja: mediana de `repeat` passadas e pico de memória de uma passada extra.
+
+    Returns:
+        dict: Resultado da loja (formato do JSON de saída)
+    """
+    # Aquecimento (imports tardios, caches de regex, JIT do navegador)
+    run_once(store_name, pages, extract)
+
+    runs = [run_once(store_name, pages, extract) for _ in range(repeat)]
+    cards = runs[0][1]
+    products = runs[0][2]
+
+    stages = {
+        stage: statistics.median(run[0][stage] for run in runs)
+        for stage in STAGES
+    }
+    total = sum(stages.values())
+
+    tracemalloc.start()
+    run_once(store_name, pages, extract)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "pages": len(pages),
+        "cards": cards,
+        "products": products,
+        "total_seconds": round(total, 6),
+        "cards_per_second": round(cards / total, 1) if total > 0 else None,
+        "stages_seconds": {stage: round(value, 6) for stage, value in stages.items()},
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+def compare(current, baseline, threshold=0.2):
+    """
+    Compara com uma execução anterior.
+
+    Returns:
+        list: Mensagens de regressão (loja/etapa mais lenta que `threshold`)
+    """
+    regressions = []
+    for store_name, result in current["stores"].items():
+        previous = baseline.get("stores", {}).get(store_name)
+        if not previous:
+            continue
+
+        if result["cards"] != previous["cards"] or result["products"] != previous["products"]:
+            regressions.append(
+                f"{store_name}: cartões/produtos mudaram "
+                f"({previous['cards']}/{previous['products']} -> {result['cards']}/{result['products']})"
+            )
+
+        for stage in STAGES:
+            before = previous["stages_seconds"].get(stage)
+            after = result["stages_seconds"][stage]
+            if before and after > before * (1 + threshold):
+                regressions.append(
+                    f"{store_name}/{stage}: {before * 1000:.2f}ms -> {after * 1000:.2f}ms "
+                    f"(+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da extração sobre snapshots salvos")
+    parser.add_argument("--snapshots", default=SNAPSHOT_DIR, help="Pasta dos snapshots")
+    parser.add_argument("--store", action="append", help="Limitar a uma loja (pode repetir)")
+    parser.add_argument("--repeat", type=int, default=5, help="Passadas por loja")
+    parser.add_argument("--browser", action="store_true",
+                        help="Extrair com o JS do navegador em vez do parser HTML")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Aumento de tempo tolerado por etapa (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.snapshots, args.store)
+    if not corpus:
+        print(f"Nenhum snapshot encontrado em {args.snapshots}. Grave com SCRAPER_SNAPSHOT_MODE=record.")
+        sys.exit(1)
+
+    pool = None
+    context = None
+    extract = parse_cards_html
+    if args.browser:
+        from browser_pool import BrowserPool
+        pool = BrowserPool()
+        extract, context = _browser_extractor(pool)
+
+    result = {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "extractor": "browser" if args.browser else "html",
+        "repeat": args.repeat,
+        "stores": {},
+    }
+
+    try:
+        for store_name, pages in corpus.items():
+            store_result = bench_store(store_name, pages, extract, args.repeat)
+            result["stores"][store_name] = store_result
+            stages = " ".join(
+                f"{stage}={value * 1000:.2f}ms"
+                for stage, value in store_result["stages_seconds"].items()
+            )
+            print(f"{store_name}: {store_result['cards']} cartões em {store_result['pages']} páginas, "
+                  f"{store_result['cards_per_second']} cartões/s, pico {store_result['peak_memory_kb']}KB ({stages})")
+    finally:
+        if context:
+            context.close()
+        if pool:
+            pool.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=4, ensure_ascii=False)
+        print(f"Resultado salvo em {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print("\nRegressões detectadas:")
+            for message in regressions:
+                print(f"  - {message}")
+            sys.exit(1)
+        print("\nSem regressões em relação a", args.compare)
+
+if __name__ == "__main__":
+    main()
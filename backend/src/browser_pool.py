@@ -0,0 +1,284 @@
+"""
+Pool de Navegador Compartilhado
+
+Lança o Chromium uma única vez por execução (ou por worker) e entrega a cada
+scraper um contexto novo e isolado (cookies, cache e storage próprios).
+Os scrapers recebem o contexto injetado e não controlam mais o ciclo de vida
+do navegador.
+"""
+
+import os
+import queue
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import Future
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+
+# User-Agent Desktop fixo e moderno (garante o layout correto nas lojas)
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+
+# Argumentos anti-detecção usados por todos os scrapers
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-setuid-sandbox"
+]
+
+# Opções padrão de cada contexto (podem ser sobrescritas por loja)
+CONTEXT_OPTIONS = {
+    'user_agent': USER_AGENT,
+    'viewport': {'width': 1920, 'height': 1080},
+    'locale': 'pt-BR',
+    'extra_http_headers': {
+        'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7'
+    }
+}
+
+# Script para esconder webdriver
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+
+# Bloqueio de recursos: os scrapers só leem texto dos cartões, então imagens,
+# fontes, mídia e rastreadores são abortados antes de sair do navegador.
+# SCRAPER_BLOCK_RESOURCES=0 desliga o bloqueio (útil para depurar uma loja).
+BLOCK_RESOURCES = os.environ.get("SCRAPER_BLOCK_RESOURCES", "1") != "0"
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Domínios de analytics/anúncios (subdomínios incluídos)
+BLOCKED_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "adservice.google.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "tiktok.com",
+    "analytics.tiktok.com",
+    "bing.com",
+    "newrelic.com",
+    "nr-data.net",
+    "dynatrace.com",
+    "sentry.io",
+    "rtbhouse.com",
+    "smartlook.com",
+    "onesignal.com",
+]
+
+def _is_blocked_domain(url):
+    host = urlparse(url).hostname or ""
+    return any(host == domain or host.endswith("." + domain) for domain in BLOCKED_DOMAINS)
+
+def block_resources(context, allow_urls=None):
+    """
+    Aborta imagens, fontes, mídia e rastreadores em todas as páginas do contexto.
+
+    Args:
+        context (BrowserContext): Contexto a proteger
+        allow_urls (list, optional): Trechos de URL que a loja precisa para
+            renderizar os cartões (nunca são bloqueados)
+    """
+    allow_urls = allow_urls or []
+
+    def handle(route):
+        request = route.request
+        if any(pattern in request.url for pattern in allow_urls):
+            return route.continue_()
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_domain(request.url):
+            return route.abort()
+        return route.continue_()
+
+    context.route("**/*", handle)
+
+class BrowserPool:
+    """
+    Mantém um único processo Chromium e cria contextos isolados sob demanda.
+
+    A API sync do Playwright fica presa à thread que a iniciou, então cada
+    thread/processo de scraping deve ter o seu próprio pool.
+
+    Uso:
+        with BrowserPool() as pool:
+            context = pool.new_context()
+            ...
+            context.close()
+    """
+
+    def __init__(self, headless=True):
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+
+    def start(self):
+        if self._browser:
+            return self
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(
+            headless=self.headless,
+            args=LAUNCH_ARGS
+        )
+        return self
+
+    def new_context(self, allow_urls=None, **overrides):
+        """
+        Cria um contexto novo e isolado no navegador compartilhado.
+
+        Args:
+            allow_urls (list, optional): Exceções ao bloqueio de recursos da loja
+            **overrides: Opções de `browser.new_context` que substituem CONTEXT_OPTIONS
+
+        Returns:
+            BrowserContext: Contexto pronto para uso (o chamador deve fechá-lo)
+        """
+        if not self._browser or not self._browser.is_connected():
+            # Navegador caiu (ou nunca foi iniciado): relançar
+            self.close()
+            self.start()
+
+        options = {**CONTEXT_OPTIONS, **overrides}
+        context = self._browser.new_context(**options)
+        context.add_init_script(STEALTH_SCRIPT)
+        if BLOCK_RESOURCES:
+            block_resources(context, allow_urls)
+        return context
+
+    def close(self):
+        try:
+            if self._browser:
+                self._browser.close()
+        except Exception as e:
+            print(f"Erro ao fechar navegador: {e}")
+        finally:
+            self._browser = None
+
+        try:
+            if self._playwright:
+                self._playwright.stop()
+        except Exception as e:
+            print(f"Erro ao encerrar Playwright: {e}")
+        finally:
+            self._playwright = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BrowserWorkers:
+    """
+    Threads dedicadas, cada uma dona do seu próprio BrowserPool.
+
+    Como a API sync do Playwright não pode trocar de thread, cada worker lança
+    (uma vez) o seu Chromium e executa as tarefas recebidas até o encerramento.
+    O número de workers é o limite de lojas rodando ao mesmo tempo.
+
+    Uso:
+        with BrowserWorkers(3) as workers:
+            future = workers.submit(func, arg)  # func(pool, arg)
+            future.result()
+    """
+
+    def __init__(self, workers=3, headless=True):
+        self.workers = max(1, int(workers))
+        self.headless = headless
+        self._jobs = queue.Queue()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return self
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                name=f"browser-worker-{i + 1}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Agenda `func(pool, *args, **kwargs)` em um worker livre.
+
+        Returns:
+            concurrent.futures.Future: Resultado (ou exceção) da tarefa
+        """
+        if not self._threads:
+            self.start()
+        future = Future()
+        self._jobs.put((future, func, args, kwargs))
+        return future
+
+    def _worker_loop(self):
+        pool = BrowserPool(headless=self.headless)
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+
+                future, func, args, kwargs = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    pool.start()
+                    future.set_result(func(pool, *args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            pool.close()
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+
+@contextmanager
+def scraper_context(context=None, context_factory=None, **overrides):
+    """
+    Entrega um contexto de navegador para um scraper.
+
+    Se `context` for informado (injetado pelo orquestrador), ele é usado como
+    está e continua pertencendo ao chamador; `context_factory` faz o mesmo,
+    mas o contexto só é criado aqui, quando o scraper realmente precisa dele.
+    Caso contrário, um navegador temporário é lançado só para esta chamada
+    (útil ao rodar um scraper isolado).
+    """
+    if context is None and context_factory is not None:
+        context = context_factory()
+    if context is not None:
+        yield context
+        return
+
+    with BrowserPool() as pool:
+        own_context = pool.new_context(**overrides)
+        try:
+            yield own_context
+        finally:
+            own_context.close()
@@ -0,0 +1,187 @@
+"""
+Catálogo Canônico de Produtos
+
+Cada anúncio (loja + nome original) aponta para um produto do catálogo com
+ID inteiro estável. Resultados novos são atribuídos de forma incremental:
+
+    1. anúncio já conhecido           -> mesmo listing_id / product_id
+    2. mesma chave normalizada         -> produto existente
+    3. nome parecido na mesma categoria (product_matching.top_matches)
+                                       -> produto existente
+    4. nenhum dos anteriores           -> produto novo
+
+Os índices (chave normalizada -> produto, loja + nome -> anúncio) ficam em
+memória depois da primeira carga, então cada lote só consulta o banco para
+gravar o que é novo.
+"""
+
+import os
+import threading
+from product_matching import top_matches
+
+# Score mínimo (0-100) para associar um nome novo a um produto existente
+CATALOG_MATCH_THRESHOLD = float(os.environ.get("CATALOG_MATCH_THRESHOLD", "80"))
+
+# Linhas por página na carga inicial (limite padrão da API do Supabase)
+PAGE_SIZE = 1000
+
+def _fetch_all(client, table, columns):
+    rows = []
+    start = 0
+    while True:
+        # Ordenado pela chave primária: sem ordem as páginas podem pular linhas
+        page = (
+            client.table(table).select(columns)
+            .order("id")
+            .range(start, start + PAGE_SIZE - 1)
+            .execute()
+            .data
+        )
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+class ProductCatalog:
+    """Índices em memória das tabelas `products` e `listings`."""
+
+    def __init__(self, client):
+        self.client = client
+        self.products_by_key = {}   # normalized_name -> id
+        self.products_by_category = {}   # categoria -> [(id, display_name)]
+        self.listings = {}   # (store, product_name) -> (listing_id, product_id)
+        self._indexed_ids = set()   # produtos já presentes em products_by_category
+        self._loaded = False
+
+    def load(self):
+        if self._loaded:
+            return
+        for row in _fetch_all(self.client, "products", "id, normalized_name, display_name, category"):
+            self._index_product(row)
+        for row in _fetch_all(self.client, "listings", "id, store, product_name, product_id"):
+            self.listings[(row["store"], row["product_name"])] = (row["id"], row["product_id"])
+        self._loaded = True
+        print(f"Catálogo carregado: {len(self.products_by_key)} produtos, {len(self.listings)} anúncios.")
+
+    def _index_product(self, row):
+        self.products_by_key[row["normalized_name"]] = row["id"]
+        # O upsert também devolve produtos que já existiam: não repetir candidatos
+        if row["id"] in self._indexed_ids:
+            return
+        self._indexed_ids.add(row["id"])
+        self.products_by_category.setdefault(row.get("category"), []).append(
+            (row["id"], row["display_name"])
+        )
+
+    def _match_approximate(self, pending):
+        """
+        Associa nomes sem chave exata a produtos parecidos da mesma categoria.
+
+        Args:
+            pending (dict): {normalized_name: (nome original, características)}
+
+        Returns:
+            dict: {normalized_name: product_id} dos que encontraram correspondência
+        """
+        by_category = {}
+        for normalized_name, (name, features) in pending.items():
+            by_category.setdefault(features.get("category"), []).append((normalized_name, name))
+
+        matched = {}
+        for category, entries in by_category.items():
+            candidates = self.products_by_category.get(category)
+            if not candidates:
+                continue
+            found = top_matches(
+                [name for _, name in entries],
+                [display_name for _, display_name in candidates],
+                k=1,
+                threshold=CATALOG_MATCH_THRESHOLD
+            )
+            for (normalized_name, _), best in zip(entries, found):
+                if best:
+                    matched[normalized_name] = candidates[best[0][0]][0]
+        return matched
+
+    def _create_products(self, pending):
+        rows = [
+            {
+                "normalized_name": normalized_name,
+                "display_name": name,
+                "category": features.get("category"),
+                "brand": features.get("brand"),
+                "model": features.get("model"),
+            }
+            for normalized_name, (name, features) in pending.items()
+        ]
+        created = self.client.table("products").upsert(rows, on_conflict="normalized_name").execute().data
+        for row in created:
+            self._index_product(row)
+
+    def _create_listings(self, new_listings):
+        rows = [
+            {"store": store, "product_name": name, "url": url, "product_id": product_id}
+            for (store, name), (url, product_id) in new_listings.items()
+        ]
+        created = self.client.table("listings").upsert(rows, on_conflict="store,product_name").execute().data
+        for row in created:
+            self.listings[(row["store"], row["product_name"])] = (row["id"], row["product_id"])
+
+    def assign(self, items, normalized):
+        """
+        Preenche `product_id` e `listing_id` de cada item (in-place).
+
+        Args:
+            items (list): Registros de price_history (product_name, store, url, ...)
+            normalized (list): [(nome normalizado, características), ...] de cada item
+        """
+        self.load()
+
+        # 1 e 2: anúncio conhecido ou chave normalizada existente
+        pending = {}
+        for item, (normalized_name, features) in zip(items, normalized):
+            if (item["store"], item["product_name"]) in self.listings:
+                continue
+            if normalized_name not in self.products_by_key and normalized_name not in pending:
+                pending[normalized_name] = (item["product_name"], features)
+
+        # 3: nome parecido; 4: produto novo
+        if pending:
+            for normalized_name, product_id in self._match_approximate(pending).items():
+                self.products_by_key[normalized_name] = product_id
+                del pending[normalized_name]
+        if pending:
+            self._create_products(pending)
+            print(f"Catálogo: {len(pending)} produtos novos.")
+
+        new_listings = {}
+        for item, (normalized_name, _) in zip(items, normalized):
+            listing_key = (item["store"], item["product_name"])
+            if listing_key not in self.listings and listing_key not in new_listings:
+                new_listings[listing_key] = (item.get("url"), self.products_by_key[normalized_name])
+        if new_listings:
+            self._create_listings(new_listings)
+
+        # Resolver todos antes de alterar os itens (lote inteiro com ou sem IDs)
+        ids = [self.listings[(item["store"], item["product_name"])] for item in items]
+        for item, (listing_id, product_id) in zip(items, ids):
+            item["listing_id"] = listing_id
+            item["product_id"] = product_id
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def assign_catalog_ids(client, items, normalized):
+    """
+    Atribui product_id/listing_id aos itens usando o catálogo do processo.
+
+    O catálogo é carregado na primeira chamada e mantido em memória entre os
+    lotes (e entre os termos de busca da mesma execução). O lock serializa
+    os lotes salvos em paralelo pelo modo async.
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ProductCatalog(client)
+        _catalog.client = client
+        _catalog.assign(items, normalized)
@@ -1,29 +1,86 @@
 import os
-from supabase import create_client, Client
+import threading
+import httpx
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
 from datetime import datetime
-from product_normalizer import normalize_product_name
 
 # Load env variables from .env file
+# (antes dos módulos abaixo, que leem as suas configurações no import)
 load_dotenv()
 
+from normalization_cache import cached_normalize_many
+from catalog import assign_catalog_ids
+from ingestion import INGEST_MODE, split_changes, update_latest, backfill_latest
+from runs import current_run_id
+
 url: str = os.environ.get("SUPABASE_URL")
 key: str = os.environ.get("SUPABASE_KEY")
 
+# Pool de conexões keep-alive do cliente compartilhado
+SUPABASE_POOL_SIZE = int(os.environ.get("SUPABASE_POOL_SIZE", "10"))
+SUPABASE_TIMEOUT = float(os.environ.get("SUPABASE_TIMEOUT", "30"))
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+def _create_client() -> Client:
+    timeout = httpx.Timeout(SUPABASE_TIMEOUT, connect=min(10.0, SUPABASE_TIMEOUT))
+    limits = httpx.Limits(
+        max_connections=SUPABASE_POOL_SIZE,
+        max_keepalive_connections=SUPABASE_POOL_SIZE
+    )
+    try:
+        # supabase-py recente aceita um httpx.Client próprio (pool configurável)
+        options = ClientOptions(
+            postgrest_client_timeout=timeout,
+            httpx_client=httpx.Client(timeout=timeout, limits=limits)
+        )
+    except TypeError:
+        # Versões anteriores: a sessão interna do PostgREST já é keep-alive
+        options = ClientOptions(postgrest_client_timeout=timeout)
+    return create_client(url, key, options=options)
+
 def get_supabase_client() -> Client:
+    """
+    Cliente Supabase compartilhado pelo processo.
+
+    Criado uma única vez (e a sua sessão HTTP keep-alive reaproveitada) em vez
+    de um `create_client` por lote. Seguro para as threads dos modos
+    concorrentes; processos filhos criam o seu próprio cliente.
+    """
+    global _client, _client_pid
     if not url or not key:
         print("ERRO: SUPABASE_URL ou SUPABASE_KEY não configurados no arquivo .env")
         return None
-    return create_client(url, key)
 
-def save_price_history(data: list):
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = _create_client()
+                _client_pid = pid
+    return _client
+
+def save_price_history(data: list, raise_errors=False, backfill=False):
     """
     Salva uma lista de dicionários de preços no Supabase.
     Adiciona campo 'normalized_name' para identificação consistente.
+    
+    Com `raise_errors=True` a falha é repassada a quem chamou (o writer
+    em segundo plano usa isso para tentar de novo).
+
+    Com `backfill=True` (registros antigos, ver import_json.py) todos os
+    registros entram no histórico, sem a ingestão só de mudanças, e
+    price_latest só avança com registros mais novos que o seu last_seen.
+
+    Returns:
+        bool: False se nada foi salvo por falta de cliente Supabase configurado
     """
     supabase = get_supabase_client()
     if not supabase:
-        return
+        return False
 
     if not data:
         print("Nenhum dado para salvar.")
@@ -32,27 +89,70 @@ def save_price_history(data: list):
     try:
         # Adicionar normalized_name e timestamp a cada item
         enriched_data = []
-        for item in data:
-            # Normalizar nome do produto
-            normalized_name = normalize_product_name(
-                item.get('product_name', ''),
-                item.get('store')
-            )
-            
+        run_id = current_run_id()
+        # Normalizar todos os nomes de uma vez (títulos já vistos vêm do cache em disco)
+        normalized = cached_normalize_many(item.get('product_name') or '' for item in data)
+        for item, (normalized_name, _) in zip(data, normalized):
             enriched_item = {
                 "product_name": item.get('product_name'),
                 "normalized_name": normalized_name,  # NOVO CAMPO
                 "price": item.get('price'),
                 "store": item.get('store'),
                 "url": item.get('url'),
-                "timestamp": datetime.now().isoformat()  # Timestamp automático
+                # Timestamp automático (registros reimportados mantêm o original)
+                "timestamp": item.get('timestamp') or datetime.now().isoformat()
             }
+            if run_id is not None:
+                enriched_item["run_id"] = run_id
             enriched_data.append(enriched_item)
         
+        # IDs do catálogo canônico (products/listings)
+        try:
+            assign_catalog_ids(supabase, enriched_data, normalized)
+        except Exception as e:
+            # Sem o catálogo (ex: migração ainda não aplicada) o histórico continua sendo salvo
+            print(f"Aviso: catálogo de produtos indisponível ({e}), salvando sem product_id.")
+        
+        if backfill:
+            # price_latest primeiro: refazer o lote depois de uma falha não muda nada lá
+            try:
+                advanced = backfill_latest(supabase, enriched_data)
+            except Exception as e:
+                print(f"Aviso: falha ao atualizar price_latest: {e}")
+                advanced = 0
+            supabase.table("price_history").insert(enriched_data).execute()
+            print(f"Sucesso! {len(enriched_data)} registros antigos salvos no banco de dados "
+                  f"({advanced} anúncios com preço mais recente em price_latest).")
+            return
+
+        # Somente mudanças de preço viram novos pontos no histórico
+        try:
+            changed, unchanged = split_changes(supabase, enriched_data)
+        except Exception as e:
+            print(f"Aviso: price_latest indisponível ({e}), inserindo todos os registros.")
+            changed, unchanged = enriched_data, None
+        to_insert = changed if INGEST_MODE == "changes" else enriched_data
+        
         # Inserir no Supabase
-        response = supabase.table("price_history").insert(enriched_data).execute()
+        if to_insert:
+            response = supabase.table("price_history").insert(to_insert).execute()
+        
+        if unchanged is None:
+            print(f"Sucesso! {len(to_insert)} registros salvos no banco de dados.")
+            return
+        
+        try:
+            update_latest(supabase, changed, unchanged, run_id)
+        except Exception as e:
+            print(f"Aviso: falha ao atualizar price_latest: {e}")
         
-        print(f"Sucesso! {len(enriched_data)} registros salvos no banco de dados.")
+        if INGEST_MODE == "changes":
+            print(f"Sucesso! {len(to_insert)} registros salvos no banco de dados "
+                  f"({len(unchanged)} sem mudança de preço, só last_seen atualizado).")
+        else:
+            print(f"Sucesso! {len(to_insert)} registros salvos no banco de dados.")
         
     except Exception as e:
         print(f"Erro ao salvar no Supabase: {e}")
+        if raise_errors:
+            raise
@@ -0,0 +1,305 @@
+"""
+Exportação Estática (JSON fatiado para CDN)
+
+Gera, ao final de cada coleta, arquivos JSON já agrupados para hospedagem
+estática, para que o frontend busque alguns KB de uma CDN em vez de consultar
+o Supabase a cada visita:
+
+    manifest.json                         -> índice: categorias e quantidade de anúncios
+    categories/<categoria>.<hash>.json    -> último preço (+ resumo) dos anúncios da categoria
+    history/<produto>.<hash>.json         -> agregados diários de um produto/loja
+
+O frontend (frontend/src/lib/staticData.js) lê o manifest, busca os arquivos
+de categoria em paralelo e o histórico só do produto aberto no modal.
+
+Os nomes levam o hash do conteúdo: uma categoria cujos preços não mudaram
+mantém o nome (e o cache da CDN e do navegador), e só o manifest.json
+precisa de cache curto. Cada arquivo também é gravado pré-comprimido (.gz e,
+com o pacote `brotli` instalado, .br); o manifest lista as versões geradas.
+Servidores com gzip_static/brotli_static servem essas versões direto da
+pasta. O Supabase Storage não envia Content-Encoding: lá as versões vão como
+application/gzip e application/x-brotli (a codificação fica nos metadados) e
+o frontend descomprime o .gz no navegador.
+
+EXPORT_DIR muda a pasta de saída; com EXPORT_BUCKET os arquivos também são
+enviados para um bucket público do Supabase Storage (só os que ainda não
+existem lá, removendo os que não são mais referenciados).
+
+Rodar depois de rollups.py e price_analytics.py:
+
+    python export_static.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from db import get_supabase_client
+from normalization_cache import cached_normalize_many
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+EXPORT_DIR = os.environ.get(
+    "EXPORT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "export")
+)
+EXPORT_BUCKET = os.environ.get("EXPORT_BUCKET")
+
+# Dias de agregados diários em cada arquivo de histórico
+EXPORT_HISTORY_DAYS = int(os.environ.get("EXPORT_HISTORY_DAYS", "365"))
+
+# Linhas por página nas consultas (limite padrão da API do Supabase)
+PAGE_SIZE = 1000
+
+# Cache-Control (segundos): arquivos com hash nunca mudam; o manifest sim
+CACHE_IMMUTABLE = "31536000"
+CACHE_MANIFEST = "60"
+
+MANIFEST_NAME = "manifest.json"
+FOLDERS = ["", "categories", "history"]
+
+# Sufixo -> (Content-Encoding, tipo do arquivo comprimido servido como está)
+ENCODINGS = {
+    ".gz": ("gzip", "application/gzip"),
+    ".br": ("br", "application/x-brotli"),
+}
+
+# Versões gravadas de cada arquivo (.br só com o pacote brotli)
+SUFFIXES = ["", ".gz"] + ([".br"] if brotli is not None else [])
+
+def _fetch_table(client, table, columns, order, since=None):
+    rows = []
+    start = 0
+    while True:
+        query = client.table(table).select(columns)
+        if since:
+            query = query.gte("period_start", since)
+        for column in order:
+            query = query.order(column)
+        page = query.range(start, start + PAGE_SIZE - 1).execute().data
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+def _encode(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _short_hash(value):
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()[:12]
+
+def history_key(normalized_name, store):
+    """Nome do arquivo de histórico de um produto em uma loja (sem o hash do conteúdo)."""
+    return _short_hash(f"{store}|{normalized_name}")
+
+class StaticExport:
+    """Conjunto de arquivos de uma exportação: {caminho relativo: bytes}."""
+
+    def __init__(self):
+        self.files = {}
+
+    def add(self, prefix, data):
+        """
+        Returns:
+            str: Caminho relativo com o hash do conteúdo (ex: history/ab12.9f3e.json)
+        """
+        payload = _encode(data)
+        path = f"{prefix}.{_short_hash(payload)}.json"
+        self.files[path] = payload
+        return path
+
+    def write(self, out_dir, manifest):
+        """
+        Grava os arquivos (e as versões comprimidas) em `out_dir`.
+
+        Arquivos com hash que já existem são mantidos; os que não pertencem
+        mais à exportação são removidos.
+
+        Returns:
+            int: Arquivos novos gravados
+        """
+        files = dict(self.files)
+        files[MANIFEST_NAME] = _encode(manifest)
+
+        written = 0
+        for path, payload in files.items():
+            full_path = os.path.join(out_dir, path)
+            if path != MANIFEST_NAME and os.path.exists(full_path):
+                continue
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            for suffix in SUFFIXES:
+                with open(full_path + suffix, "wb") as f:
+                    f.write(_compress(payload, suffix))
+            written += 1
+
+        keep = {path + suffix for path in files for suffix in SUFFIXES}
+        for folder in FOLDERS:
+            folder_path = os.path.join(out_dir, folder)
+            if not os.path.isdir(folder_path):
+                continue
+            for name in os.listdir(folder_path):
+                relative = f"{folder}/{name}" if folder else name
+                if relative not in keep and os.path.isfile(os.path.join(folder_path, name)):
+                    os.remove(os.path.join(folder_path, name))
+        return written
+
+    def upload(self, client, bucket, manifest):
+        """
+        Envia para o Supabase Storage apenas os arquivos que ainda não estão
+        no bucket, depois o manifest, e remove os que não são mais usados.
+
+        Returns:
+            int: Arquivos enviados
+        """
+        storage = client.storage.from_(bucket)
+        existing = set()
+        for folder in FOLDERS:
+            offset = 0
+            while True:
+                page = storage.list(folder, {"limit": PAGE_SIZE, "offset": offset})
+                existing.update(
+                    f"{folder}/{item['name']}" if folder else item["name"]
+                    for item in page if item.get("id")   # pastas não têm id
+                )
+                if len(page) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+
+        uploaded = 0
+        expected = set()
+        for path, payload in self.files.items():
+            for suffix in SUFFIXES:
+                expected.add(path + suffix)
+                if path + suffix in existing:
+                    continue
+                storage.upload(path + suffix, _compress(payload, suffix),
+                               file_options=_upload_options(suffix, CACHE_IMMUTABLE))
+                uploaded += 1
+
+        # Por último: o manifest só aponta para arquivos que já estão no bucket
+        storage.upload(MANIFEST_NAME, _encode(manifest), file_options=_upload_options("", CACHE_MANIFEST))
+
+        stale = sorted(existing - expected - {MANIFEST_NAME})
+        for i in range(0, len(stale), PAGE_SIZE):
+            storage.remove(stale[i:i + PAGE_SIZE])
+        return uploaded
+
+def _compress(payload, suffix):
+    if suffix == ".gz":
+        return gzip.compress(payload, compresslevel=9, mtime=0)
+    if suffix == ".br":
+        return brotli.compress(payload, quality=11)
+    return payload
+
+def _upload_options(suffix, cache_control):
+    """
+    Opções de upload no Supabase Storage. Cabeçalhos extras iriam na própria
+    requisição de upload (e não ficam no objeto), então a versão comprimida
+    vai com o tipo do arquivo comprimido e a codificação nos metadados.
+    """
+    options = {"content-type": "application/json", "cache-control": cache_control, "upsert": "true"}
+    if suffix:
+        encoding, content_type = ENCODINGS[suffix]
+        options["content-type"] = content_type
+        options["metadata"] = {"contentType": "application/json", "contentEncoding": encoding}
+    return options
+
+def build_export(client):
+    """
+    Lê price_latest, product_summary e price_daily e monta os arquivos.
+
+    Returns:
+        tuple: (StaticExport, manifest)
+    """
+    latest = _fetch_table(
+        client, "price_latest",
+        "store, product_name, normalized_name, product_id, url, price, previous_price, min_price, last_seen",
+        order=["store", "product_name"]
+    )
+    summaries = {
+        (row["normalized_name"], row["store"]): row
+        for row in _fetch_table(
+            client, "product_summary",
+            "normalized_name, store, current_price, is_lowest_price, trend, predicted_price, "
+            "change_percentage, r_squared, volatility",
+            order=["normalized_name", "store"]
+        )
+    }
+
+    since = (datetime.now(timezone.utc) - timedelta(days=EXPORT_HISTORY_DAYS)).date().isoformat()
+    daily = {}
+    for row in _fetch_table(
+        client, "price_daily", "normalized_name, store, period_start, min_price, last_price",
+        order=["normalized_name", "store", "period_start"], since=since
+    ):
+        daily.setdefault((row["normalized_name"], row["store"]), []).append(
+            [row["period_start"], row["last_price"], row["min_price"]]
+        )
+
+    export = StaticExport()
+
+    # Histórico: [data, último preço, menor preço] por dia
+    history_paths = {
+        key: export.add(f"history/{history_key(*key)}", {"points": points})
+        for key, points in daily.items()
+    }
+
+    categories = {}
+    normalized = cached_normalize_many(row["product_name"] for row in latest)
+    for row, (_, features) in zip(latest, normalized):
+        key = (row["normalized_name"], row["store"])
+        row["category"] = features.get("category") or "outros"
+        row["history"] = history_paths.get(key)
+        # Cópia por anúncio: vários anúncios podem ter o mesmo resumo
+        summary = summaries.get(key)
+        row["summary"] = summary and {
+            column: value for column, value in summary.items()
+            if column not in ("normalized_name", "store")
+        }
+        categories.setdefault(row["category"], []).append(row)
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "products": len(latest),
+        # Versões pré-comprimidas de cada arquivo (caminho + sufixo)
+        "encodings": SUFFIXES[1:],
+        "categories": {
+            category: {
+                "path": export.add(f"categories/{category}", {"products": rows}),
+                "products": len(rows),
+            }
+            for category, rows in sorted(categories.items())
+        },
+    }
+    return export, manifest
+
+def export_static(client=None, out_dir=EXPORT_DIR, bucket=EXPORT_BUCKET):
+    """
+    Gera a exportação estática e, se configurado, envia para o bucket.
+
+    Returns:
+        dict: O manifest gerado (ou None sem cliente Supabase)
+    """
+    client = client or get_supabase_client()
+    if not client:
+        return None
+
+    export, manifest = build_export(client)
+    written = export.write(out_dir, manifest)
+    total_bytes = sum(len(payload) for payload in export.files.values())
+    print(f"Exportação estática: {len(export.files)} arquivos ({total_bytes / 1024:.0f} KB), "
+          f"{written} novos em {out_dir}.")
+
+    if bucket:
+        uploaded = export.upload(client, bucket, manifest)
+        print(f"Exportação estática: {uploaded} arquivos enviados para o bucket '{bucket}'.")
+    return manifest
+
+if __name__ == "__main__":
+    export_static()
@@ -0,0 +1,266 @@
+"""
+Ingestão Somente de Mudanças
+
+A tabela `price_latest` guarda o último preço de cada anúncio (loja + nome
+original, a mesma chave de `listings`), o preço anterior, o menor preço já
+visto e a execução (`run_id`) em que foi visto pela última vez. É o que o
+frontend lê para montar a lista de produtos.
+
+Um novo ponto em `price_history` só é inserido quando o preço muda (ou o
+anúncio é novo); nos demais casos apenas o `last_seen` é atualizado.
+INGEST_MODE=all volta a inserir uma linha por coleta (price_latest continua
+sendo mantida).
+
+Registros antigos (import_json.py: arquivos de execução, dumps, lotes que
+falharam) seguem outro caminho, `backfill_latest`: todos entram no
+histórico, e price_latest só avança com um registro mais novo que o
+`last_seen` gravado.
+"""
+
+import os
+import threading
+from datetime import datetime, timezone
+
+INGEST_MODE = os.environ.get("INGEST_MODE", "changes")
+
+# Diferença mínima para considerar que o preço mudou (centavos arredondados)
+PRICE_EPSILON = 0.005
+
+# Linhas por página na carga dos últimos preços
+PAGE_SIZE = 1000
+
+# Nomes de anúncio por consulta no backfill (filtro in_ vai na URL)
+BACKFILL_CHUNK = 100
+
+def _listing_key(record):
+    return (record["store"], record["product_name"])
+
+def _parse_timestamp(value):
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts
+
+class LatestPrices:
+    """Últimos preços conhecidos, carregados por loja sob demanda."""
+
+    def __init__(self):
+        self.prices = {}   # (store, product_name) -> price
+        self.min_prices = {}   # (store, product_name) -> menor preço já visto
+        self._loaded_stores = set()
+        self._lock = threading.Lock()
+
+    def _load_store(self, client, store):
+        start = 0
+        while True:
+            rows = (
+                client.table("price_latest")
+                .select("store, product_name, price, min_price")
+                .eq("store", store)
+                .order("product_name")   # páginas estáveis: chave primária dentro da loja
+                .range(start, start + PAGE_SIZE - 1)
+                .execute()
+                .data
+            )
+            for row in rows:
+                key = (row["store"], row["product_name"])
+                self.prices[key] = float(row["price"])
+                min_price = row.get("min_price")
+                self.min_prices[key] = float(min_price if min_price is not None else row["price"])
+            if len(rows) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+        self._loaded_stores.add(store)
+
+    def split_changes(self, client, records):
+        """
+        Separa os registros cujo preço mudou.
+
+        Returns:
+            tuple: (mudaram ou são novos, sem mudança); um anúncio repetido no
+                   mesmo lote com o mesmo preço conta só uma vez
+        """
+        with self._lock:
+            for store in {record["store"] for record in records} - self._loaded_stores:
+                self._load_store(client, store)
+
+            changed, unchanged = [], []
+            seen = {}
+            for record in records:
+                key = _listing_key(record)
+                last_price = seen.get(key, self.prices.get(key))
+                if last_price is not None and abs(last_price - record["price"]) < PRICE_EPSILON:
+                    unchanged.append(record)
+                else:
+                    changed.append(record)
+                seen[key] = record["price"]
+            return changed, unchanged
+
+    def update(self, client, changed, unchanged, run_id=None):
+        """Atualiza `price_latest` (last_seen de todos; preço anterior, menor preço e last_changed dos que mudaram)."""
+        now = datetime.now(timezone.utc).isoformat()
+        state = {}   # (store, product_name) -> (preço, menor preço) após este lote
+
+        def rows(records, changed_now):
+            latest = {}
+            for record in records:
+                key = _listing_key(record)
+                row = {
+                    "store": record["store"],
+                    "product_name": record["product_name"],
+                    "normalized_name": record.get("normalized_name"),
+                    "url": record.get("url"),
+                    "price": record["price"],
+                    "product_id": record.get("product_id"),
+                    "listing_id": record.get("listing_id"),
+                    "last_seen": now,
+                    "run_id": run_id,
+                }
+                if changed_now:
+                    # Em ordem: se o anúncio mudar duas vezes no lote, o anterior é o penúltimo
+                    last_price, min_price = state.get(key, (self.prices.get(key), self.min_prices.get(key)))
+                    price = record["price"]
+                    row["last_changed"] = now
+                    row["previous_price"] = last_price
+                    row["min_price"] = price if min_price is None else min(min_price, price)
+                    state[key] = (price, row["min_price"])
+                latest[key] = row
+            return list(latest.values())
+
+        # Dois upserts: as colunas do lote precisam ser as mesmas em todas as linhas
+        changed_keys = {_listing_key(record) for record in changed}
+        unchanged = [record for record in unchanged if _listing_key(record) not in changed_keys]
+        with self._lock:
+            for records, changed_now in ((changed, True), (unchanged, False)):
+                if records:
+                    client.table("price_latest").upsert(
+                        rows(records, changed_now), on_conflict="store,product_name"
+                    ).execute()
+
+            # Só depois de gravado, para a memória não ficar à frente do banco
+            for key, (price, min_price) in state.items():
+                self.prices[key] = price
+                self.min_prices[key] = min_price
+
+    def _fetch_listings(self, client, keys):
+        """Linhas atuais de price_latest dos anúncios em `keys`."""
+        by_store = {}
+        for store, product_name in keys:
+            by_store.setdefault(store, []).append(product_name)
+
+        stored = {}
+        for store, names in by_store.items():
+            for i in range(0, len(names), BACKFILL_CHUNK):
+                rows = (
+                    client.table("price_latest")
+                    .select("store, product_name, price, previous_price, min_price, "
+                            "first_seen, last_seen, last_changed")
+                    .eq("store", store)
+                    .in_("product_name", names[i:i + BACKFILL_CHUNK])
+                    .execute()
+                    .data
+                )
+                stored.update({_listing_key(row): row for row in rows})
+        return stored
+
+    def backfill(self, client, records):
+        """
+        Atualiza `price_latest` com registros antigos (com `timestamp`).
+
+        Os registros de cada anúncio são aplicados em ordem de horário e só
+        os mais novos que o `last_seen` gravado mudam preço, preço anterior e
+        last_changed; first_seen e o menor preço consideram todos. Leitura e
+        gravação acontecem sob o mesmo lock, então lotes importados em
+        paralelo não se sobrepõem no mesmo anúncio.
+
+        Returns:
+            int: Anúncios cujo último preço avançou
+        """
+        by_listing = {}
+        for record in sorted(records, key=lambda r: _parse_timestamp(r["timestamp"])):
+            by_listing.setdefault(_listing_key(record), []).append(record)
+
+        with self._lock:
+            stored = self._fetch_listings(client, list(by_listing))
+            newer, older = [], []
+            for key, listing_records in by_listing.items():
+                row = stored.get(key) or {}
+                price = float(row["price"]) if row.get("price") is not None else None
+                previous_price = row.get("previous_price")
+                min_price = float(row["min_price"]) if row.get("min_price") is not None else price
+                first_seen = _parse_timestamp(row["first_seen"]) if row.get("first_seen") else None
+                last_seen = _parse_timestamp(row["last_seen"]) if row.get("last_seen") else None
+                last_changed = row.get("last_changed")
+                stored_min, stored_first = min_price, first_seen
+                latest = None
+
+                for record in listing_records:
+                    ts = _parse_timestamp(record["timestamp"])
+                    min_price = record["price"] if min_price is None else min(min_price, record["price"])
+                    first_seen = ts if first_seen is None else min(first_seen, ts)
+                    if last_seen is not None and ts <= last_seen:
+                        continue
+                    if price is None or abs(price - record["price"]) >= PRICE_EPSILON:
+                        previous_price = price
+                        price = record["price"]
+                        last_changed = ts.isoformat()
+                    last_seen = ts
+                    latest = record
+
+                if latest is not None:
+                    newer.append({
+                        "store": latest["store"],
+                        "product_name": latest["product_name"],
+                        "normalized_name": latest.get("normalized_name"),
+                        "url": latest.get("url"),
+                        "price": price,
+                        "product_id": latest.get("product_id"),
+                        "listing_id": latest.get("listing_id"),
+                        "previous_price": previous_price,
+                        "min_price": min_price,
+                        "first_seen": first_seen.isoformat(),
+                        "last_seen": last_seen.isoformat(),
+                        "last_changed": last_changed,
+                    })
+                elif min_price != stored_min or first_seen != stored_first:
+                    # Só registros antigos: podem baixar o menor preço ou first_seen
+                    older.append({
+                        "store": key[0],
+                        "product_name": key[1],
+                        "price": price,
+                        "min_price": min_price,
+                        "first_seen": first_seen.isoformat(),
+                    })
+
+            # Dois upserts: as colunas do lote precisam ser as mesmas em todas as linhas
+            for rows in (newer, older):
+                if rows:
+                    client.table("price_latest").upsert(rows, on_conflict="store,product_name").execute()
+
+            # Só depois de gravado; lojas ainda não carregadas vêm do banco quando preciso
+            for row in newer + older:
+                key = _listing_key(row)
+                if key[0] in self._loaded_stores:
+                    self.prices[key] = float(row["price"])
+                    self.min_prices[key] = float(row["min_price"])
+            return len(newer)
+
+_latest = LatestPrices()
+
+def split_changes(client, records):
+    """
+    Returns:
+        tuple: (preço mudou ou anúncio novo, sem mudança)
+    """
+    return _latest.split_changes(client, records)
+
+def update_latest(client, changed, unchanged, run_id=None):
+    """Chamar depois de inserir os registros em `price_history`."""
+    _latest.update(client, changed, unchanged, run_id)
+
+def backfill_latest(client, records):
+    """
+    Returns:
+        int: Anúncios de price_latest que avançaram com registros antigos
+    """
+    return _latest.backfill(client, records)
@@ -1,111 +1,67 @@
-import json
-import time
-import random
-from scrapers.kabum import get_kabum_prices
-from scrapers.pichau import get_pichau_prices
-from scrapers.terabyte import get_terabyte_prices
-from scrapers.mercadolivre import get_mercadolivre_prices
-from scrapers.amazon import get_amazon_prices
-from scrapers.magazineluiza import get_magazineluiza_prices
-from scrapers.americanas import get_americanas_prices
-from db import save_price_history
+import argparse
+import asyncio
+import os
+from db import save_price_history, get_supabase_client
+from browser_pool import BrowserPool, BrowserWorkers
+from stores import SCRAPERS, run_store
+from scheduler import DomainRateLimiter
+from async_runner import run_sweep_async, DEFAULT_CONCURRENCY
+from process_runner import run_sharded
+from writer import ResultWriter
+from runs import start_run, finish_run
+from run_archive import RunArchive
 
-def run_all_scrapers(query="RTX 4060"):
+# Modo de orquestração:
+#   "serial"  - uma loja por vez
+#   "async"   - lojas em paralelo (threads, um Chromium por worker)
+#   "process" - lojas divididas em SCRAPER_WORKERS processos
+SCRAPER_MODE = os.environ.get("SCRAPER_MODE", "serial")
+SCRAPER_WORKERS = int(os.environ.get("SCRAPER_WORKERS", "1"))
+
+def run_all_scrapers(query="RTX 4060", pool=None, limiter=None, writer=None):
+    """
+    Executa todos os scrapers para um termo de busca.
+
+    Args:
+        query (str): Termo de busca
+        pool (BrowserPool, optional): Navegador compartilhado da execução.
+            Se não informado, um navegador é lançado só para este termo.
+        limiter (DomainRateLimiter, optional): Rate limit por loja compartilhado
+            entre termos. Só espera quando a própria loja ainda está "esfriando".
+        writer (ResultWriter, optional): Recebe os produtos de cada loja assim
+            que ela termina. Sem writer, tudo é salvo ao final do termo.
+    """
     results = []
     
     print(f"=== Iniciando Scraping Multilojas para '{query}' ===")
-    
-    # 1. Kabum
-    try:
-        print("\n[1/7] Executando Kabum...")
-        kabum_data = get_kabum_prices(query)
-        results.extend(kabum_data)
-        print(f"-> {len(kabum_data)} produtos encontrados.")
-    except Exception as e:
-        print(f"Erro no scraper Kabum: {e}")
 
-    delay = random.uniform(2, 5)
-    print(f"Aguardando {delay:.2f}s...")
-    time.sleep(delay)
+    limiter = limiter or DomainRateLimiter()
+    own_pool = pool is None
+    if own_pool:
+        pool = BrowserPool().start()
 
-    # 2. Pichau
     try:
-        print("\n[2/7] Executando Pichau...")
-        pichau_data = get_pichau_prices(query)
-        results.extend(pichau_data)
-        print(f"-> {len(pichau_data)} produtos encontrados.")
-    except Exception as e:
-        print(f"Erro no scraper Pichau: {e}")
+        for i, (store_name, scraper) in enumerate(SCRAPERS, start=1):
+            limiter.acquire(store_name)
 
-    delay = random.uniform(2, 5)
-    print(f"Aguardando {delay:.2f}s...")
-    time.sleep(delay)
-
-    # 3. Terabyte
-    try:
-        print("\n[3/7] Executando Terabyte...")
-        terabyte_data = get_terabyte_prices(query)
-        results.extend(terabyte_data)
-        print(f"-> {len(terabyte_data)} produtos encontrados.")
-    except Exception as e:
-        print(f"Erro no scraper Terabyte: {e}")
-    
-    delay = random.uniform(2, 5)
-    print(f"Aguardando {delay:.2f}s...")
-    time.sleep(delay)
-    
-    # 4. Mercado Livre
-    try:
-        print("\n[4/7] Executando Mercado Livre...")
-        ml_data = get_mercadolivre_prices(query)
-        results.extend(ml_data)
-        print(f"-> {len(ml_data)} produtos encontrados.")
-    except Exception as e:
-        print(f"Erro no scraper Mercado Livre: {e}")
-    
-    delay = random.uniform(2, 5)
-    print(f"Aguardando {delay:.2f}s...")
-    time.sleep(delay)
-    
-    # 5. Amazon
-    try:
-        print("\n[5/7] Executando Amazon...")
-        amazon_data = get_amazon_prices(query)
-        results.extend(amazon_data)
-        print(f"-> {len(amazon_data)} produtos encontrados.")
-    except Exception as e:
-        print(f"Erro no scraper Amazon: {e}")
-    
-    delay = random.uniform(2, 5)
-    print(f"Aguardando {delay:.2f}s...")
-    time.sleep(delay)
-    
-    # 6. Magazine Luiza
-    try:
-        print("\n[6/7] Executando Magazine Luiza...")
-        magalu_data = get_magazineluiza_prices(query)
-        results.extend(magalu_data)
-        print(f"-> {len(magalu_data)} produtos encontrados.")
-    except Exception as e:
-        print(f"Erro no scraper Magazine Luiza: {e}")
-    
-    delay = random.uniform(2, 5)
-    print(f"Aguardando {delay:.2f}s...")
-    time.sleep(delay)
-    
-    # 7. Americanas
-    try:
-        print("\n[7/7] Executando Americanas...")
-        americanas_data = get_americanas_prices(query)
-        results.extend(americanas_data)
-        print(f"-> {len(americanas_data)} produtos encontrados.")
-    except Exception as e:
-        print(f"Erro no scraper Americanas: {e}")
+            try:
+                print(f"\n[{i}/{len(SCRAPERS)}] Executando {store_name}...")
+                # Contexto novo e isolado por loja, no mesmo navegador
+                store_data = run_store(pool, store_name, scraper, query)
+                results.extend(store_data)
+                print(f"-> {len(store_data)} produtos encontrados.")
+                if writer is not None and store_data:
+                    writer.put(store_data)
+            except Exception as e:
+                print(f"Erro no scraper {store_name}: {e}")
+    finally:
+        if own_pool:
+            pool.close()
 
     print(f"\n=== Finalizado. Total de produtos coletados: {len(results)} ===")
     
     # Salvar no Banco de Dados
-    if results:
+    if results and writer is None:
         print("Salvando no Supabase...")
         save_price_history(results)
     
@@ -126,23 +82,50 @@ if __name__ == "__main__":
         "Fonte 650W"
     ]
 
-    all_results = []
-    
-    print(f"=== Iniciando Coleta de {len(products_to_search)} Termos ===")
+    parser = argparse.ArgumentParser(description="Coleta de preços multilojas")
+    parser.add_argument("--mode", choices=["serial", "async", "process"], default=SCRAPER_MODE,
+                        help="Modo de orquestração (padrão: $SCRAPER_MODE ou serial)")
+    parser.add_argument("--workers", type=int, default=SCRAPER_WORKERS,
+                        help="Processos no modo 'process' (padrão: $SCRAPER_WORKERS ou 1)")
+    args = parser.parse_args()
 
-    for product in products_to_search:
-        print(f"\n>>> Buscando: {product}")
-        results = run_all_scrapers(product)
-        all_results.extend(results)
-        
-        # Delay extra entre produtos para não sobrecarregar
-        delay = random.uniform(5, 10)
-        print(f"Sleeping {delay:.2f}s before next product...")
-        time.sleep(delay)
-    
-    # Opcional: Salvar em arquivo para debug
-    with open("dataset_multiloja_poc.json", "w", encoding="utf-8") as f:
-        json.dump(all_results, f, indent=4, ensure_ascii=False)
+    # Com 1 worker o modo process é o próprio modo serial
+    mode = args.mode
+    if mode == "process" and args.workers <= 1:
+        mode = "serial"
+
+    print(f"=== Iniciando Coleta de {len(products_to_search)} Termos (modo {mode}) ===")
+
+    # Rate limit por loja substitui as pausas fixas entre lojas e entre termos
+    limiter = DomainRateLimiter()
+
+    # Registros salvos nesta execução levam o run_id (ver runs.py)
+    client = get_supabase_client()
+    run_id = start_run(client, mode)
+    status = "failed"
+
+    # Produtos vão para o writer assim que cada loja termina: o Supabase é
+    # gravado em segundo plano e o arquivo JSON Lines da execução na hora
+    archive = RunArchive(products_to_search, mode, run_id).open()
+    writer = ResultWriter(archive=archive)
+    try:
+        with writer:
+            if mode == "process":
+                run_sharded(products_to_search, args.workers, writer=writer)
+            elif mode == "async":
+                # Um Chromium por worker, reaproveitado em toda a varredura
+                with BrowserWorkers(DEFAULT_CONCURRENCY) as workers:
+                    asyncio.run(run_sweep_async(products_to_search, workers, limiter, writer=writer))
+            else:
+                # Um único Chromium para toda a varredura
+                with BrowserPool() as pool:
+                    for product in products_to_search:
+                        print(f"\n>>> Buscando: {product}")
+                        run_all_scrapers(product, pool=pool, limiter=limiter, writer=writer)
+        status = "completed"
+    finally:
+        archive.close(status)
+        finish_run(client, run_id, writer.received, status)
     
-    print(f"\nColeta Finalizada. Total acumulado: {len(all_results)} itens.")
-    print("Dados salvos em dataset_multiloja_poc.json")
+    print(f"\nColeta Finalizada. Total acumulado: {writer.received} itens.")
+    print(f"Dados salvos em {archive.path}")
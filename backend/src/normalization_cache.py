@@ -0,0 +1,175 @@
+"""
+Cache Persistente de Normalização (SQLite)
+
+Guarda (nome original, versão do normalizador) -> nome normalizado e
+características, para que os mesmos títulos não sejam normalizados de novo
+a cada execução do cron nem no import_json.py.
+
+A versão é o hash do código de product_normalizer.py: qualquer mudança nas
+regras gera uma versão nova e as entradas antigas deixam de ser usadas
+(ficam disponíveis para `rekey_map`, que mostra quais chaves mudaram).
+
+NORMALIZATION_CACHE=0 desliga o cache; NORMALIZATION_CACHE_PATH muda o arquivo.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+import product_normalizer
+from product_normalizer import normalize_many
+
+NORMALIZATION_CACHE = os.environ.get("NORMALIZATION_CACHE", "1") != "0"
+
+NORMALIZATION_CACHE_PATH = os.environ.get(
+    "NORMALIZATION_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "normalization.sqlite3")
+)
+
+# Limite de parâmetros por consulta (SQLite antigo aceita no máximo 999)
+QUERY_CHUNK = 500
+
+def normalizer_version():
+    """Hash das regras de normalização (código-fonte de product_normalizer.py)."""
+    with open(product_normalizer.__file__, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()[:12]
+
+NORMALIZER_VERSION = normalizer_version()
+
+class NormalizationCache:
+    """Cache SQLite de `normalize_many`, invalidado pela versão do normalizador."""
+
+    def __init__(self, path=NORMALIZATION_CACHE_PATH, version=NORMALIZER_VERSION):
+        self.path = path
+        self.version = version
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS normalized_names (
+                    product_name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    normalized_name TEXT NOT NULL,
+                    features TEXT NOT NULL,
+                    PRIMARY KEY (product_name, version)
+                ) WITHOUT ROWID
+            """)
+
+    @contextmanager
+    def _connect(self):
+        # Uma conexão por operação: save_price_history roda em threads diferentes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:  # commit (ou rollback em erro)
+                yield conn
+        finally:
+            conn.close()
+
+    def lookup(self, product_names):
+        """
+        Returns:
+            dict: {nome original: (nome normalizado, características)} dos nomes em cache
+        """
+        names = list(product_names)
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(names), QUERY_CHUNK):
+                chunk = names[i:i + QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT product_name, normalized_name, features FROM normalized_names "
+                    f"WHERE version = ? AND product_name IN ({placeholders})",
+                    [self.version, *chunk]
+                )
+                for product_name, normalized_name, features in rows:
+                    found[product_name] = (normalized_name, json.loads(features))
+        return found
+
+    def store(self, results):
+        """Grava {nome original: (nome normalizado, características)} na versão atual."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO normalized_names "
+                "(product_name, version, normalized_name, features) VALUES (?, ?, ?, ?)",
+                [
+                    (name, self.version, normalized_name, json.dumps(features))
+                    for name, (normalized_name, features) in results.items()
+                ]
+            )
+
+    def normalize_many(self, product_names):
+        """
+        Mesmo contrato de `product_normalizer.normalize_many`, consultando o
+        cache antes e gravando os nomes que ainda não estavam nele.
+        """
+        product_names = list(product_names)
+        unique = list(dict.fromkeys(product_names))
+
+        results = self.lookup(unique)
+        missing = [name for name in unique if name not in results]
+        if missing:
+            computed = dict(zip(missing, normalize_many(missing)))
+            self.store(computed)
+            results.update(computed)
+
+        return [results[name] for name in product_names]
+
+    def rekey_map(self):
+        """
+        Compara as versões antigas com a atual, para re-chavear o histórico.
+
+        Returns:
+            dict: {nome original: (chave antiga, chave nova)} apenas dos nomes
+                  cuja chave mudou com as regras atuais
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT product_name, normalized_name FROM normalized_names WHERE version != ?",
+                [self.version]
+            ).fetchall()
+
+        old_keys = dict(rows)
+        new_keys = self.normalize_many(old_keys)
+        return {
+            name: (old_keys[name], new_key)
+            for name, (new_key, _) in zip(old_keys, new_keys)
+            if old_keys[name] != new_key
+        }
+
+    def purge_stale(self):
+        """Remove as entradas de versões antigas do normalizador."""
+        with self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM normalized_names WHERE version != ?", [self.version]
+            ).rowcount
+        return deleted
+
+_cache = None
+
+def cached_normalize_many(product_names):
+    """
+    `normalize_many` com o cache persistente (se habilitado).
+
+    Falhas no SQLite (disco cheio, arquivo travado) não interrompem a coleta:
+    nesse caso normaliza em memória.
+    """
+    global _cache
+    product_names = list(product_names)
+    if not NORMALIZATION_CACHE:
+        return normalize_many(product_names)
+
+    try:
+        if _cache is None:
+            _cache = NormalizationCache()
+        return _cache.normalize_many(product_names)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Cache de normalização indisponível ({e}), normalizando em memória...")
+        return normalize_many(product_names)
+
+if __name__ == "__main__":
+    cache = NormalizationCache()
+    changed = cache.rekey_map()
+    print(f"Versão do normalizador: {cache.version}")
+    print(f"Chaves alteradas em relação às versões antigas: {len(changed)}")
+    for name, (old_key, new_key) in list(changed.items())[:20]:
+        print(f"  {old_key} -> {new_key}  ({name})")
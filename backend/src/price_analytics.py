@@ -0,0 +1,178 @@
+"""
+Resumo Analítico por Produto (NumPy)
+
+Calcula de uma vez, sobre todo o `price_history`, o que o frontend fazia no
+navegador para cada grupo de produto (utils/analytics.js e priceAnalytics.js):
+tendência por regressão linear, R², previsão para 7 dias, volatilidade
+(coeficiente de variação), preço anterior e se o preço atual é o menor já
+visto. O resultado vai para `product_summary`, uma linha por
+(normalized_name, store), lida diretamente pelo frontend.
+
+Diferente de analytics.js, o eixo x da regressão é o tempo em dias e não o
+índice do registro: com a ingestão somente de mudanças os pontos não são
+igualmente espaçados.
+
+Rodar depois de cada main_scraper.py:
+
+    python price_analytics.py
+"""
+
+from datetime import datetime, timezone
+import numpy as np
+from db import get_supabase_client
+from rollups import fetch_new_rows, _parse_timestamp
+
+# Registros de price_history lidos por consulta
+FETCH_CHUNK = 10000
+
+# Linhas por upsert em product_summary
+PAGE_SIZE = 1000
+
+# Mesmas tolerâncias do frontend (priceAnalytics.js)
+PRICE_EPSILON = 0.01
+PREDICTION_DAYS = 7
+SECONDS_PER_DAY = 86400.0
+
+def load_history(client):
+    """
+    Returns:
+        tuple: (chaves, dias, preços) com uma posição por registro válido;
+               chaves são (normalized_name, store)
+    """
+    keys, days, prices = [], [], []
+    last_id = 0
+    while True:
+        rows = fetch_new_rows(client, last_id, FETCH_CHUNK)
+        for row in rows:
+            if row.get("price") is None or not row.get("normalized_name"):
+                continue
+            keys.append((row["normalized_name"], row["store"]))
+            days.append(_parse_timestamp(row["timestamp"]).timestamp() / SECONDS_PER_DAY)
+            prices.append(float(row["price"]))
+        if len(rows) < FETCH_CHUNK:
+            break
+        last_id = rows[-1]["id"]
+    return keys, np.array(days, dtype=np.float64), np.array(prices, dtype=np.float64)
+
+def summarize(keys, days, prices):
+    """
+    Estatísticas de todos os grupos em uma passada vetorizada.
+
+    Args:
+        keys (list): (normalized_name, store) de cada registro
+        days (np.ndarray): Timestamp de cada registro, em dias
+        prices (np.ndarray): Preço de cada registro
+
+    Returns:
+        list: Linhas de product_summary
+    """
+    if not keys:
+        return []
+
+    labels = {}
+    codes = np.fromiter((labels.setdefault(key, len(labels)) for key in keys), dtype=np.int64, count=len(keys))
+    group_keys = list(labels)
+    n_groups = len(group_keys)
+
+    # Ordenar por grupo e depois por data: cada grupo vira uma fatia contígua
+    order = np.lexsort((days, codes))
+    codes, days, prices = codes[order], days[order], prices[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)] - 1
+
+    n = np.bincount(codes, minlength=n_groups).astype(np.float64)
+
+    def group_sum(values):
+        return np.bincount(codes, weights=values, minlength=n_groups)
+
+    # x relativo ao primeiro registro do grupo (estabilidade numérica)
+    x = days - days[starts][codes]
+    y = prices
+    sum_x, sum_y = group_sum(x), group_sum(y)
+    sum_xx, sum_xy, sum_yy = group_sum(x * x), group_sum(x * y), group_sum(y * y)
+
+    mean_y = sum_y / n
+    denominator = n * sum_xx - sum_x * sum_x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(denominator > 0, (n * sum_xy - sum_x * sum_y) / denominator, 0.0)
+        intercept = (sum_y - slope * sum_x) / n
+
+        residuals = y - (slope[codes] * x + intercept[codes])
+        ss_res = group_sum(residuals * residuals)
+        ss_tot = sum_yy - n * mean_y * mean_y
+        r_squared = np.where(ss_tot > 1e-9, 1.0 - ss_res / ss_tot, 0.0)
+
+        variance = np.maximum(sum_yy / n - mean_y * mean_y, 0.0)
+        volatility = np.where(mean_y > 0, np.sqrt(variance) / mean_y * 100.0, 0.0)
+
+    current = prices[ends]
+    last_x = x[ends]
+    predicted = slope * (last_x + PREDICTION_DAYS) + intercept
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_percentage = np.where(current > 0, (predicted - current) / current * 100.0, 0.0)
+
+    min_price = np.minimum.reduceat(prices, starts)
+    max_price = np.maximum.reduceat(prices, starts)
+
+    # Preço anterior: último registro do grupo com preço diferente do atual
+    differs = np.abs(prices - current[codes]) > PRICE_EPSILON
+    positions = np.where(differs, np.arange(len(prices)), -1)
+    previous_index = np.maximum.reduceat(positions, starts)
+
+    enough = n >= 3   # mesmo mínimo de calculatePriceTrend
+    now = datetime.now(timezone.utc).isoformat()
+    rows = []
+    # codes ordenados: a posição g do grupo é o próprio código
+    for g, (normalized_name, store) in enumerate(group_keys):
+        has_trend = bool(enough[g])
+        trend = "stable"
+        if has_trend and slope[g] > 0:
+            trend = "rising"
+        elif has_trend and slope[g] < 0:
+            trend = "falling"
+
+        rows.append({
+            "normalized_name": normalized_name,
+            "store": store,
+            "samples": int(n[g]),
+            "first_seen": datetime.fromtimestamp(days[starts[g]] * SECONDS_PER_DAY, timezone.utc).isoformat(),
+            "last_seen": datetime.fromtimestamp(days[ends[g]] * SECONDS_PER_DAY, timezone.utc).isoformat(),
+            "current_price": round(float(current[g]), 2),
+            "previous_price": round(float(prices[previous_index[g]]), 2) if previous_index[g] >= 0 else None,
+            "min_price": round(float(min_price[g]), 2),
+            "max_price": round(float(max_price[g]), 2),
+            "mean_price": round(float(mean_y[g]), 4),
+            "is_lowest_price": bool(current[g] <= min_price[g] + PRICE_EPSILON),
+            "trend": trend,
+            "slope_per_day": round(float(slope[g]), 6) if has_trend else None,
+            "r_squared": round(float(np.clip(r_squared[g], 0.0, 1.0)), 4) if has_trend else None,
+            "predicted_price": round(float(predicted[g]), 2) if has_trend else None,
+            "change_percentage": round(float(change_percentage[g]), 4) if has_trend else None,
+            "volatility": round(float(volatility[g]), 4),
+            "updated_at": now,
+        })
+    return rows
+
+def update_product_summary(client=None):
+    """
+    Recalcula e grava `product_summary`.
+
+    Returns:
+        int: Quantidade de produtos (normalized_name, store) resumidos
+    """
+    client = client or get_supabase_client()
+    if not client:
+        return 0
+
+    keys, days, prices = load_history(client)
+    rows = summarize(keys, days, prices)
+    for i in range(0, len(rows), PAGE_SIZE):
+        client.table("product_summary").upsert(
+            rows[i:i + PAGE_SIZE], on_conflict="normalized_name,store"
+        ).execute()
+
+    print(f"Resumo analítico: {len(rows)} produtos a partir de {len(keys)} registros.")
+    return len(rows)
+
+if __name__ == "__main__":
+    update_product_summary()
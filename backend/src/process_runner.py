@@ -0,0 +1,170 @@
+"""
+Runner Multi-processo
+
+Divide os jobs (termo, loja) entre N processos, cada um com o seu próprio
+Chromium, para usar todos os núcleos da VM. O particionamento é por loja:
+todos os termos de uma loja ficam no mesmo processo, assim o rate limit por
+domínio continua valendo. O processo pai junta os resultados e salva no Supabase
+(com um ResultWriter, os produtos chegam ao pai job a job por uma fila).
+
+Com N=1 roda no próprio processo, igual ao modo serial.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from browser_pool import BrowserWorkers
+from stores import SCRAPERS
+from scheduler import DomainRateLimiter, build_jobs, run_jobs_async
+from db import save_price_history
+
+def shard_stores(store_names, workers):
+    """
+    Distribui as lojas entre os workers (round-robin, na ordem de SCRAPERS).
+
+    Returns:
+        list: Uma lista de nomes de lojas por worker (sem listas vazias)
+    """
+    shards = [[] for _ in range(max(1, workers))]
+    for i, store_name in enumerate(store_names):
+        shards[i % len(shards)].append(store_name)
+    return [shard for shard in shards if shard]
+
+def _run_shard(queries, store_names, result_queue=None):
+    """
+    Executado dentro do processo worker: um navegador para todas as lojas do shard.
+
+    Args:
+        queries (list): Termos de busca
+        store_names (list): Lojas deste shard
+        result_queue (Queue, optional): Fila do Manager; com ela, os produtos
+            de cada job vão para o processo pai assim que o job termina
+
+    Returns:
+        list: Produtos de cada job do shard, na ordem de `build_jobs`
+              (listas vazias com `result_queue`)
+    """
+    scrapers = [(name, scraper) for name, scraper in SCRAPERS if name in store_names]
+    jobs = build_jobs(queries, scrapers)
+
+    on_result = None
+    if result_queue is not None:
+        async def on_result(job, store_data):
+            # put bloqueia com a fila cheia (pai atrasado): esperar fora do event loop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, result_queue.put, (job["query"], job["store"], store_data))
+
+    # Um único worker de navegador: as lojas do shard se alternam enquanto
+    # cada uma espera o seu rate limit
+    with BrowserWorkers(1) as workers:
+        return asyncio.run(run_jobs_async(
+            jobs, workers, DomainRateLimiter(),
+            on_result=on_result, keep_results=result_queue is None
+        ))
+
+def _stream_shards(queries, shards, writer):
+    """
+    Roda os shards enviando os produtos de cada job ao writer assim que o job
+    termina: nenhum processo acumula o shard inteiro, e a queda de um worker
+    perde só o job em andamento.
+    """
+    shard_of = {store: ", ".join(shard) for shard in shards for store in shard}
+    totals = {name: 0 for name in shard_of.values()}
+
+    def push(item):
+        query, store, store_data = item
+        totals[shard_of[store]] += len(store_data)
+        if store_data:
+            writer.put(store_data)
+
+    with multiprocessing.Manager() as manager:
+        # Limitada: se o writer ficar para trás, os workers esperam
+        result_queue = manager.Queue(maxsize=len(shards) * 2)
+
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            futures = {
+                executor.submit(_run_shard, queries, shard, result_queue): ", ".join(shard)
+                for shard in shards
+            }
+
+            pending = set(futures)
+            while pending:
+                try:
+                    push(result_queue.get(timeout=0.5))
+                except queue.Empty:
+                    pass
+
+                for future in [f for f in pending if f.done()]:
+                    pending.remove(future)
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Erro no processo das lojas {futures[future]}: {e}")
+
+        # Jobs concluídos logo antes do fim dos processos
+        while True:
+            try:
+                push(result_queue.get_nowait())
+            except queue.Empty:
+                break
+
+    for name, total in totals.items():
+        print(f"-> Processo {name}: {total} produtos.")
+
+def run_sharded(queries, workers=2, writer=None):
+    """
+    Executa a matriz termos × lojas em `workers` processos.
+
+    Args:
+        queries (list): Termos de busca
+        workers (int): Número de processos (cada um com o seu Chromium)
+        writer (ResultWriter, optional): Recebe os produtos de cada job assim
+            que ele termina, via fila do Manager (sem acumular a varredura
+            nem o shard)
+
+    Returns:
+        list: Todos os produtos, na ordem termo → loja (vazia com `writer`)
+    """
+    store_names = [name for name, _ in SCRAPERS]
+    shards = shard_stores(store_names, workers)
+    print(f"=== Dividindo {len(store_names)} lojas em {len(shards)} processos ===")
+
+    if writer is not None:
+        _stream_shards(queries, shards, writer)
+        return []
+
+    # (termo, loja) -> produtos, para remontar a ordem do modo serial
+    by_job = {}
+
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        futures = {
+            executor.submit(_run_shard, queries, shard): shard
+            for shard in shards
+        }
+
+        for future in as_completed(futures):
+            shard = futures[future]
+            try:
+                shard_results = future.result()
+            except Exception as e:
+                print(f"Erro no processo das lojas {', '.join(shard)}: {e}")
+                continue
+
+            scrapers = [(name, scraper) for name, scraper in SCRAPERS if name in shard]
+            shard_products = []
+            for job, store_data in zip(build_jobs(queries, scrapers), shard_results):
+                by_job[(job["query"], job["store"])] = store_data
+                shard_products.extend(store_data)
+
+            print(f"-> Processo {', '.join(shard)}: {len(shard_products)} produtos.")
+
+            # Salvar no Banco de Dados (somente no processo pai)
+            if shard_products:
+                print("Salvando no Supabase...")
+                save_price_history(shard_products)
+
+    results = []
+    for job in build_jobs(queries):
+        results.extend(by_job.get((job["query"], job["store"]), []))
+    return results
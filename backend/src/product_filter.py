@@ -1,3 +1,5 @@
+import re
+
 # Lista de palavras que indicam produtos NÃO relacionados a hardware/PC
 # Se o nome do produto contiver QUALQUER uma dessas palavras, será rejeitado
 BLACKLIST_KEYWORDS = [
@@ -68,6 +70,84 @@ WHITELIST_KEYWORDS = [
     'roteador', 'modem', 'switch', 'access point', 'wi-fi',
 ]
 
+# Aceitar apenas produtos com alguma palavra da whitelist
+# Desligado por padrão para não ser muito restritivo
+REQUIRE_WHITELIST = False
+
+def _build_trie(keywords, trie=None):
+    """Trie {caractere: filho}; a chave "" marca o fim de uma palavra."""
+    trie = {} if trie is None else trie
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = keyword
+    return trie
+
+def _trie_pattern(node):
+    """
+    Alternância sem lookahead a partir da trie: em cada nó os filhos começam
+    por caracteres diferentes, então só resta decidir entre parar ou seguir,
+    e o `?` guloso faz a palavra mais longa vencer.
+    """
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    return f"(?:{body})?" if "" in node else body
+
+BLACKLIST_SET = frozenset(kw.lower() for kw in BLACKLIST_KEYWORDS)
+WHITELIST_SET = frozenset(kw.lower() for kw in WHITELIST_KEYWORDS) - BLACKLIST_SET
+
+# Compiladas uma vez no import. Com `search`, o re pula direto para as
+# posições cujo caractere começa alguma palavra e tenta só aquele ramo.
+BLACKLIST_RE = re.compile(_trie_pattern(_build_trie(BLACKLIST_SET)))
+KEYWORDS_RE = re.compile(_trie_pattern(_build_trie(BLACKLIST_SET, _build_trie(WHITELIST_SET))))
+
+def _overlaps(whitelist_word):
+    """Alguma palavra da blacklist pode começar dentro de `whitelist_word` (ou junto com ela)?"""
+    return any(
+        whitelist_word[k:].startswith(kw) or kw.startswith(whitelist_word[k:])
+        for k in range(len(whitelist_word))
+        for kw in BLACKLIST_SET
+    )
+
+# Palavras da whitelist que podem esconder o começo de uma da blacklist:
+# depois delas a blacklist é procurada a partir do início da palavra
+OVERLAPPING_WHITELIST = frozenset(kw for kw in WHITELIST_SET if _overlaps(kw))
+
+def match_product(product_name, require_whitelist=REQUIRE_WHITELIST):
+    """
+    Avalia blacklist e whitelist em uma única passada pelo nome.
+    
+    Args:
+        product_name (str): Nome do produto
+        require_whitelist (bool): Rejeitar nomes sem palavra da whitelist
+        
+    Returns:
+        tuple: (válido, regra, palavra), onde regra é "blacklist",
+               "whitelist" ou None (nenhuma palavra encontrada)
+    """
+    name = product_name.lower()
+    match = KEYWORDS_RE.search(name)
+    
+    if match is None:
+        # 2. (Opcional) Aceitar apenas se contiver pelo menos uma palavra da whitelist
+        return not require_whitelist, None, None
+    
+    # 1. Rejeitar se contiver palavras da blacklist
+    keyword = match.group()
+    if keyword in BLACKLIST_SET:
+        return False, "blacklist", keyword
+    
+    # Antes da palavra da whitelist não há nenhuma da blacklist; o resto
+    # do nome só precisa ser procurado na blacklist
+    start = match.start() if keyword in OVERLAPPING_WHITELIST else match.end()
+    blacklisted = BLACKLIST_RE.search(name, start)
+    if blacklisted:
+        return False, "blacklist", blacklisted.group()
+    return True, "whitelist", keyword
+
 def is_valid_pc_product(product_name):
     """
     Verifica se um produto é válido (relacionado a hardware/PC).
@@ -78,18 +158,25 @@ def is_valid_pc_product(product_name):
     Returns:
         bool: True se for válido, False se deve ser rejeitado
     """
-    name_lower = product_name.lower()
+    return match_product(product_name)[0]
+
+def filter_many(product_names, require_whitelist=REQUIRE_WHITELIST):
+    """
+    Versão em lote de `is_valid_pc_product` (ex: refiltrar o histórico).
     
-    # 1. Rejeitar se contiver palavras da blacklist
-    for keyword in BLACKLIST_KEYWORDS:
-        if keyword.lower() in name_lower:
-            return False
-    
-    # 2. (Opcional) Aceitar apenas se contiver pelo menos uma palavra da whitelist
-    # Comentado por padrão para não ser muito restritivo
-    # if WHITELIST_KEYWORDS:
-    #     has_valid_keyword = any(kw.lower() in name_lower for kw in WHITELIST_KEYWORDS)
-    #     if not has_valid_keyword:
-    #         return False
-    
-    return True
+    Nomes repetidos são avaliados uma única vez.
+    
+    Args:
+        product_names (iterable): Nomes dos produtos
+        require_whitelist (bool): Rejeitar nomes sem palavra da whitelist
+        
+    Returns:
+        list: Lista de bool, na mesma ordem de `product_names`
+    """
+    seen = {}
+    results = []
+    for name in product_names:
+        if name not in seen:
+            seen[name] = match_product(name, require_whitelist)[0]
+        results.append(seen[name])
+    return results
@@ -0,0 +1,148 @@
+"""
+Comparação de Produtos em Lote (NumPy)
+
+Versão vetorizada de `product_normalizer.calculate_similarity` para casar
+milhares de anúncios entre lojas de uma vez: cada nome é normalizado e
+tokenizado uma única vez, vira um vetor binário de tokens, e a similaridade
+de Jaccard de todos os pares sai de um produto de matrizes:
+
+    interseção = A · Bᵀ
+    união      = |a| + |b| - interseção
+    score      = 100 · interseção / união
+
+O cálculo é feito em blocos de linhas para limitar a memória (N×M floats
+por bloco em vez da matriz inteira quando só o top-k interessa).
+"""
+
+import numpy as np
+from product_normalizer import normalize_many
+
+def tokenize_many(product_names):
+    """
+    Returns:
+        list: Conjunto de tokens do nome normalizado de cada produto
+              (os mesmos de `calculate_similarity`)
+    """
+    return [set(normalized.split('_')) for normalized, _ in normalize_many(product_names)]
+
+def token_matrices(tokens_a, tokens_b):
+    """
+    Vetores binários de tokens sobre um vocabulário comum.
+
+    Returns:
+        tuple: (A, B) em float32, formas (N, V) e (M, V)
+    """
+    vocabulary = {}
+    for tokens in tokens_a + tokens_b:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+
+    def build(token_sets):
+        matrix = np.zeros((len(token_sets), len(vocabulary)), dtype=np.float32)
+        rows = [i for i, tokens in enumerate(token_sets) for _ in tokens]
+        cols = [vocabulary[token] for tokens in token_sets for token in tokens]
+        matrix[rows, cols] = 1.0
+        return matrix
+
+    return build(tokens_a), build(tokens_b)
+
+def _iter_score_blocks(names_a, names_b, chunk_size):
+    A, B = token_matrices(tokenize_many(names_a), tokenize_many(names_b))
+    sizes_b = B.sum(axis=1)
+    B_t = np.ascontiguousarray(B.T)
+
+    for start in range(0, A.shape[0], chunk_size):
+        block = A[start:start + chunk_size]
+        intersection = block @ B_t
+        union = block.sum(axis=1)[:, None] + sizes_b[None, :] - intersection
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(union > 0, intersection / union * 100.0, 0.0)
+        yield start, scores
+
+def similarity_matrix(names_a, names_b, chunk_size=1024):
+    """
+    Similaridade (0-100) de todos os pares entre duas listas de nomes.
+
+    Args:
+        names_a (list): Nomes da primeira lista (N)
+        names_b (list): Nomes da segunda lista (M)
+        chunk_size (int): Linhas de A processadas por bloco
+
+    Returns:
+        np.ndarray: Matriz N×M com o mesmo score de `calculate_similarity`
+    """
+    result = np.zeros((len(names_a), len(names_b)), dtype=np.float32)
+    if not len(names_a) or not len(names_b):
+        return result
+    for start, scores in _iter_score_blocks(names_a, names_b, chunk_size):
+        result[start:start + scores.shape[0]] = scores
+    return result
+
+def top_matches(names_a, names_b, k=3, threshold=60.0, chunk_size=1024):
+    """
+    Melhores correspondências em `names_b` para cada nome de `names_a`.
+
+    Args:
+        names_a (list): Nomes a casar (ex: anúncios de uma loja)
+        names_b (list): Nomes candidatos (ex: anúncios de outra loja)
+        k (int): Máximo de correspondências por nome
+        threshold (float): Score mínimo (0-100)
+        chunk_size (int): Linhas de A processadas por bloco
+
+    Returns:
+        list: Para cada nome de A, [(índice em B, score), ...] do maior para o menor
+    """
+    matches = [[] for _ in names_a]
+    if not len(names_a) or not len(names_b) or k <= 0:
+        return matches
+
+    k = min(k, len(names_b))
+    for start, scores in _iter_score_blocks(names_a, names_b, chunk_size):
+        # Top-k sem ordenar a linha inteira
+        if k < scores.shape[1]:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        for row in range(scores.shape[0]):
+            matches[start + row] = [
+                (int(j), float(score))
+                for j, score in zip(candidates[row], candidate_scores[row])
+                if score >= threshold
+            ]
+    return matches
+
+def match_stores(products, k=3, threshold=60.0):
+    """
+    Casa os produtos de cada loja com os das outras lojas.
+
+    Args:
+        products (list): Produtos no formato dos scrapers ({"product_name", "store", ...})
+        k (int): Máximo de correspondências por produto em cada outra loja
+        threshold (float): Score mínimo (0-100)
+
+    Returns:
+        list: [(índice do produto, índice do correspondente, score), ...]
+              com índices em `products`; cada par de lojas é comparado uma
+              vez (até `k` correspondentes da loja seguinte por produto)
+    """
+    by_store = {}
+    for index, product in enumerate(products):
+        by_store.setdefault(product.get("store"), []).append(index)
+
+    pairs = []
+    stores = list(by_store)
+    for i, store_a in enumerate(stores):
+        indexes_a = by_store[store_a]
+        names_a = [products[idx]["product_name"] for idx in indexes_a]
+        for store_b in stores[i + 1:]:
+            indexes_b = by_store[store_b]
+            names_b = [products[idx]["product_name"] for idx in indexes_b]
+            for row, found in enumerate(top_matches(names_a, names_b, k, threshold)):
+                for col, score in found:
+                    pairs.append((indexes_a[row], indexes_b[col], score))
+    return pairs
@@ -5,7 +5,9 @@ Identifica produtos equivalentes mesmo com nomes diferentes entre lojas.
 Exemplo: "RTX 4060 ASUS 8GB" e "ASUS Dual RTX4060 8GB GDDR6" são reconhecidos como o mesmo produto.
 """
 
+import os
 import re
+from functools import lru_cache
 from unidecode import unidecode
 
 # Marcas conhecidas por categoria
@@ -32,6 +34,167 @@ STOPWORDS = [
     'dual', 'oc', 'edition', 'black', 'white', 'rgb', 'led'
 ]
 
+# Tamanho do cache LRU (nomes distintos); os mesmos títulos se repetem a cada execução
+NORMALIZER_CACHE_SIZE = int(os.environ.get("NORMALIZER_CACHE_SIZE", "50000"))
+
+class ProductNormalizer:
+    """
+    Normalizador com padrões pré-compilados e cache LRU por nome original.
+    
+    O resultado depende apenas do nome, então cada título distinto é
+    processado uma única vez enquanto estiver no cache.
+    """
+    
+    def __init__(self, cache_size=NORMALIZER_CACHE_SIZE):
+        self.gpu_re = re.compile(GPU_PATTERN, re.IGNORECASE)
+        self.cpu_amd_re = re.compile(CPU_AMD_PATTERN, re.IGNORECASE)
+        self.cpu_intel_re = re.compile(CPU_INTEL_PATTERN, re.IGNORECASE)
+        self.ram_capacity_re = re.compile(RAM_CAPACITY_PATTERN, re.IGNORECASE)
+        self.clean_re = re.compile(r'[^a-z0-9_]')
+        self.stopwords = frozenset(STOPWORDS)
+        
+        # (marca, marca normalizada, categoria) na ordem de KNOWN_BRANDS
+        self.brands = [
+            (brand, brand.replace(' ', '').replace('.', ''), category)
+            for category, brands in KNOWN_BRANDS.items()
+            for brand in brands
+        ]
+        
+        self._analyze_cached = lru_cache(maxsize=cache_size)(self._analyze)
+    
+    def _extract_features(self, name):
+        # `name` já em minúsculas e sem acentos
+        features = {
+            'brand': None,
+            'model': None,
+            'variant': None,
+            'capacity': None,
+            'category': None
+        }
+        
+        # Detectar categoria e marca
+        for brand, brand_key, category in self.brands:
+            if brand in name:
+                features['brand'] = brand_key
+                features['category'] = category
+                break
+        
+        # Detectar modelo GPU
+        gpu_match = self.gpu_re.search(name)
+        if gpu_match:
+            model = gpu_match.group(1)
+            variant = gpu_match.group(2) if gpu_match.group(2) else ''
+            features['model'] = f"rtx{model}" if 'rtx' in name or 'gtx' in name else f"rx{model}"
+            features['variant'] = variant.lower() if variant else None
+            features['category'] = 'gpu'
+        
+        # Detectar modelo CPU AMD
+        cpu_amd_match = self.cpu_amd_re.search(name)
+        if cpu_amd_match:
+            series = cpu_amd_match.group(1)
+            model = cpu_amd_match.group(2)
+            features['model'] = f"ryzen{series}_{model}"
+            features['category'] = 'cpu'
+        
+        # Detectar modelo CPU Intel
+        cpu_intel_match = self.cpu_intel_re.search(name)
+        if cpu_intel_match:
+            series = cpu_intel_match.group(1)
+            model = cpu_intel_match.group(2)
+            features['model'] = f"i{series}_{model}"
+            features['category'] = 'cpu'
+        
+        # Detectar capacidade (RAM/Storage)
+        capacity_match = self.ram_capacity_re.search(name)
+        if capacity_match:
+            size = capacity_match.group(1)
+            ddr = capacity_match.group(2) if capacity_match.group(2) else ''
+            features['capacity'] = f"{size}gb" + (f"_ddr{ddr}" if ddr else "")
+            if not features['category']:
+                features['category'] = 'ram' if ddr else 'storage'
+        
+        return features
+    
+    def _analyze(self, product_name):
+        name = unidecode(product_name.lower())  # Remove acentos
+        features = self._extract_features(name)
+        
+        # Montar tokens do nome normalizado
+        tokens = [
+            features[key]
+            for key in ('brand', 'model', 'variant', 'capacity')
+            if features.get(key)
+        ]
+        
+        # Se não conseguiu extrair nada, usar estratégia de fallback
+        if not tokens:
+            # Remover stopwords
+            words = [w for w in name.split() if w not in self.stopwords and len(w) > 2]
+            tokens = words[:4]  # Primeiras 4 palavras significativas
+        
+        # Criar nome normalizado e limpar caracteres especiais
+        normalized = self.clean_re.sub('', '_'.join(tokens))
+        return normalized, features
+    
+    def analyze(self, product_name):
+        """
+        Nome normalizado e características do produto (com cache).
+        
+        Returns:
+            tuple: (nome normalizado, dict de características)
+        """
+        normalized, features = self._analyze_cached(product_name)
+        # Cópia para que quem chama não altere o valor guardado no cache
+        return normalized, dict(features)
+    
+    def normalize(self, product_name, store=None):
+        return self._analyze_cached(product_name)[0]
+    
+    def extract_features(self, product_name):
+        return self.analyze(product_name)[1]
+    
+    def normalize_many(self, product_names):
+        """
+        Normaliza uma lista de nomes de uma vez.
+        
+        Args:
+            product_names (iterable): Nomes completos dos produtos
+            
+        Returns:
+            list: [(nome normalizado, características), ...] na mesma ordem
+        """
+        analyze = self.analyze
+        return [analyze(name) for name in product_names]
+    
+    def similarity(self, name1, name2):
+        norm1 = self.normalize(name1)
+        norm2 = self.normalize(name2)
+        
+        # Se nomes normalizados são iguais, 100% similar
+        if norm1 == norm2:
+            return 100.0
+        
+        # Caso contrário, usar similaridade de tokens
+        tokens1 = set(norm1.split('_'))
+        tokens2 = set(norm2.split('_'))
+        
+        intersection = tokens1 & tokens2
+        union = tokens1 | tokens2
+        
+        if not union:
+            return 0.0
+        
+        return (len(intersection) / len(union)) * 100.0
+    
+    def cache_info(self):
+        return self._analyze_cached.cache_info()
+    
+    def cache_clear(self):
+        self._analyze_cached.cache_clear()
+
+# Instância compartilhada usada pelas funções do módulo
+_normalizer = ProductNormalizer()
+
 def extract_features(product_name):
     """
     Extrai características principais do produto.
@@ -48,62 +211,7 @@ def extract_features(product_name):
             'category': str
         }
     """
-    name = product_name.lower()
-    name = unidecode(name)  # Remove acentos
-    
-    features = {
-        'brand': None,
-        'model': None,
-        'variant': None,
-        'capacity': None,
-        'category': None
-    }
-    
-    # Detectar categoria e marca
-    for category, brands in KNOWN_BRANDS.items():
-        for brand in brands:
-            if brand in name:
-                features['brand'] = brand.replace(' ', '').replace('.', '')
-                features['category'] = category
-                break
-        if features['brand']:
-            break
-    
-    # Detectar modelo GPU
-    gpu_match = re.search(GPU_PATTERN, name, re.IGNORECASE)
-    if gpu_match:
-        model = gpu_match.group(1)
-        variant = gpu_match.group(2) if gpu_match.group(2) else ''
-        features['model'] = f"rtx{model}" if 'rtx' in name or 'gtx' in name else f"rx{model}"
-        features['variant'] = variant.lower() if variant else None
-        features['category'] = 'gpu'
-    
-    # Detectar modelo CPU AMD
-    cpu_amd_match = re.search(CPU_AMD_PATTERN, name, re.IGNORECASE)
-    if cpu_amd_match:
-        series = cpu_amd_match.group(1)
-        model = cpu_amd_match.group(2)
-        features['model'] = f"ryzen{series}_{model}"
-        features['category'] = 'cpu'
-    
-    # Detectar modelo CPU Intel
-    cpu_intel_match = re.search(CPU_INTEL_PATTERN, name, re.IGNORECASE)
-    if cpu_intel_match:
-        series = cpu_intel_match.group(1)
-        model = cpu_intel_match.group(2)
-        features['model'] = f"i{series}_{model}"
-        features['category'] = 'cpu'
-    
-    # Detectar capacidade (RAM/Storage)
-    capacity_match = re.search(RAM_CAPACITY_PATTERN, name, re.IGNORECASE)
-    if capacity_match:
-        size = capacity_match.group(1)
-        ddr = capacity_match.group(2) if capacity_match.group(2) else ''
-        features['capacity'] = f"{size}gb" + (f"_ddr{ddr}" if ddr else "")
-        if not features['category']:
-            features['category'] = 'ram' if ddr else 'storage'
-    
-    return features
+    return _normalizer.extract_features(product_name)
 
 def normalize_product_name(product_name, store=None):
     """
@@ -120,40 +228,19 @@ def normalize_product_name(product_name, store=None):
         "Placa de Vídeo RTX 4060 ASUS Dual 8GB" → "asus_rtx4060_8gb"
         "ASUS RTX4060 Dual OC 8GB GDDR6" → "asus_rtx4060_8gb"
     """
-    features = extract_features(product_name)
-    
-    # Montar tokens do nome normalizado
-    tokens = []
-    
-    if features.get('brand'):
-        tokens.append(features['brand'])
-    
-    if features.get('model'):
-        tokens.append(features['model'])
-    
-    if features.get('variant'):
-        tokens.append(features['variant'])
-    
-    if features.get('capacity'):
-        tokens.append(features['capacity'])
-    
-    # Se não conseguiu extrair nada, usar estratégia de fallback
-    if not tokens:
-        # Limpar e tokenizar nome original
-        name = product_name.lower()
-        name = unidecode(name)
-        # Remover stopwords
-        words = name.split()
-        words = [w for w in words if w not in STOPWORDS and len(w) > 2]
-        tokens = words[:4]  # Primeiras 4 palavras significativas
-    
-    # Criar nome normalizado
-    normalized = '_'.join(tokens)
-    
-    # Limpar caracteres especiais
-    normalized = re.sub(r'[^a-z0-9_]', '', normalized)
+    return _normalizer.normalize(product_name, store)
+
+def normalize_many(product_names):
+    """
+    Versão em lote de `normalize_product_name` + `extract_features`.
     
-    return normalized
+    Args:
+        product_names (iterable): Nomes completos dos produtos
+        
+    Returns:
+        list: [(nome normalizado, características), ...] na mesma ordem
+    """
+    return _normalizer.normalize_many(product_names)
 
 def calculate_similarity(name1, name2):
     """
@@ -166,24 +253,7 @@ def calculate_similarity(name1, name2):
     Returns:
         float: Score de 0-100 (100 = idênticos)
     """
-    norm1 = normalize_product_name(name1)
-    norm2 = normalize_product_name(name2)
-    
-    # Se nomes normalizados são iguais, 100% similar
-    if norm1 == norm2:
-        return 100.0
-    
-    # Caso contrário, usar similaridade de tokens
-    tokens1 = set(norm1.split('_'))
-    tokens2 = set(norm2.split('_'))
-    
-    intersection = tokens1 & tokens2
-    union = tokens1 | tokens2
-    
-    if not union:
-        return 0.0
-    
-    return (len(intersection) / len(union)) * 100.0
+    return _normalizer.similarity(name1, name2)
 
 # Função auxiliar para testes
 if __name__ == "__main__":
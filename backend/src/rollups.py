@@ -0,0 +1,364 @@
+"""
+Agregados Diários e Semanais de Preço
+
+Mantém `price_daily` e `price_weekly` com min, max, média, último preço e
+quantidade de registros por (normalized_name, store, período), para que
+gráficos e consultas de períodos longos leiam algumas centenas de linhas em
+vez de todos os pontos de `price_history`.
+
+Só processa os registros novos: o maior `price_history.id` já agregado em
+cada tabela fica em `rollup_state` (watermark). Rodar depois de cada
+main_scraper.py:
+
+    python rollups.py
+
+Os períodos usam a data UTC do registro; a semana começa na segunda-feira.
+
+Com INGEST_MODE=changes, price_history só recebe um ponto quando o preço
+muda, então um anúncio com preço estável não teria linhas nos dias sem
+mudança. Depois dos registros novos, cada execução leva o preço em vigor
+adiante a partir de `price_latest`: cada período entre a execução anterior
+(horário guardado em rollup_state como `<tabela>_carry`) e o `last_seen` do
+anúncio inclui o preço que valia nele. O preço atual vale de `last_changed`
+até `last_seen`; antes da mudança, vale `previous_price`. Assim min, max e
+último preço de um período consideram também um preço definido antes dele e
+ainda em vigor.
+
+`samples` conta só os pontos gravados em price_history (mudanças de
+preço, ou todas as coletas com INGEST_MODE=all). Um período sem nenhum ponto
+gravado, preenchido só pelo preço em vigor, tem samples = 0 e
+mean_price = último preço.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from db import get_supabase_client
+
+# Registros de price_history processados por vez (o watermark avança a cada bloco)
+ROLLUP_CHUNK = int(os.environ.get("ROLLUP_CHUNK", "10000"))
+
+# Linhas por página nas consultas (limite padrão da API do Supabase)
+PAGE_SIZE = 1000
+
+# Produtos por consulta das linhas já agregadas (filtro in_ vai na URL)
+NAMES_PER_QUERY = 100
+
+# Tabela -> início do período de um timestamp
+PERIODS = {
+    "price_daily": lambda ts: ts.date(),
+    "price_weekly": lambda ts: (ts - timedelta(days=ts.weekday())).date(),
+}
+
+def _parse_timestamp(value):
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+def get_watermarks(client):
+    """
+    Returns:
+        dict: {tabela: maior id de price_history já agregado nela}
+    """
+    rows = client.table("rollup_state").select("name, last_id").execute().data
+    found = {row["name"]: row["last_id"] for row in rows}
+    return {table: found.get(table, 0) for table in PERIODS}
+
+def set_watermark(client, table, last_id):
+    client.table("rollup_state").upsert({
+        "name": table,
+        "last_id": last_id,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }, on_conflict="name").execute()
+
+def get_carry_since(client, table):
+    """
+    Returns:
+        datetime: Horário da última vez que o preço em vigor foi levado
+            adiante em `table` (None se nunca foi)
+    """
+    rows = (
+        client.table("rollup_state").select("updated_at")
+        .eq("name", f"{table}_carry").execute().data
+    )
+    return _parse_timestamp(rows[0]["updated_at"]) if rows else None
+
+def set_carry_since(client, table, when):
+    client.table("rollup_state").upsert({
+        "name": f"{table}_carry",
+        "last_id": 0,
+        "updated_at": when.isoformat(),
+    }, on_conflict="name").execute()
+
+def fetch_new_rows(client, after_id, limit):
+    """
+    Returns:
+        list: Registros de price_history com id > after_id, em ordem de id
+    """
+    rows = []
+    while len(rows) < limit:
+        page = (
+            client.table("price_history")
+            .select("id, normalized_name, store, price, timestamp")
+            .gt("id", rows[-1]["id"] if rows else after_id)
+            .order("id")
+            .limit(min(PAGE_SIZE, limit - len(rows)))
+            .execute()
+            .data
+        )
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            break
+    return rows
+
+def aggregate(rows, period_of):
+    """
+    Agrupa registros por (normalized_name, store, início do período).
+
+    Args:
+        rows (list): Registros de price_history
+        period_of (callable): timestamp -> data de início do período
+
+    Returns:
+        dict: {(normalized_name, store, período): agregado}
+    """
+    buckets = {}
+    for row in rows:
+        if row.get("price") is None or not row.get("normalized_name"):
+            continue
+        ts = _parse_timestamp(row["timestamp"])
+        price = float(row["price"])
+        key = (row["normalized_name"], row["store"], period_of(ts).isoformat())
+
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = {
+                "min_price": price, "max_price": price, "sum": price,
+                "samples": 1, "last_price": price, "last_at": ts,
+            }
+            continue
+        bucket["min_price"] = min(bucket["min_price"], price)
+        bucket["max_price"] = max(bucket["max_price"], price)
+        bucket["sum"] += price
+        bucket["samples"] += 1
+        if ts >= bucket["last_at"]:
+            bucket["last_price"] = price
+            bucket["last_at"] = ts
+    return buckets
+
+def fetch_latest_seen(client, since):
+    """
+    Returns:
+        list: Anúncios de price_latest vistos depois de `since` (todos se None)
+    """
+    rows = []
+    start = 0
+    while True:
+        query = client.table("price_latest").select(
+            "normalized_name, store, price, previous_price, last_changed, last_seen"
+        )
+        if since is not None:
+            query = query.gt("last_seen", since.isoformat())
+        page = (
+            query.order("store").order("product_name")
+            .range(start, start + PAGE_SIZE - 1)
+            .execute()
+            .data
+        )
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+def _periods(period_of, start, end):
+    """Inícios dos períodos de `start` até `end` (inclusive), em ordem."""
+    periods = []
+    day = start
+    while day.date() <= end.date():
+        period = period_of(day)
+        if not periods or periods[-1] != period:
+            periods.append(period)
+        day += timedelta(days=1)
+    return periods
+
+def carry_forward(latest, period_of, since, now):
+    """
+    Preço em vigor de cada anúncio em cada período desde a execução anterior.
+
+    O preço atual vale de `last_changed` até `last_seen`; entre `since` e a
+    mudança vale `previous_price`.
+
+    Args:
+        latest (list): Linhas de price_latest (ver fetch_latest_seen)
+        period_of (callable): timestamp -> data de início do período
+        since (datetime): Execução anterior (None na primeira)
+        now (datetime): Horário desta execução (limite de `last_seen`)
+
+    Returns:
+        dict: {(normalized_name, store, período): agregado com samples = 0}
+    """
+    buckets = {}
+
+    def add(key, price, at):
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = {
+                "min_price": price, "max_price": price, "sum": 0.0,
+                "samples": 0, "last_price": price, "last_at": at,
+            }
+            return
+        bucket["min_price"] = min(bucket["min_price"], price)
+        bucket["max_price"] = max(bucket["max_price"], price)
+        if at >= bucket["last_at"]:
+            bucket["last_price"] = price
+            bucket["last_at"] = at
+
+    for row in latest:
+        if row.get("price") is None or not row.get("normalized_name"):
+            continue
+        last_seen = min(_parse_timestamp(row["last_seen"]), now)
+        changed = _parse_timestamp(row["last_changed"]) if row.get("last_changed") else last_seen
+        changed = min(changed, last_seen)
+        start = changed if since is None else min(max(since, changed), last_seen)
+
+        # Antes da mudança: o preço anterior ainda valia no início do período dela
+        if row.get("previous_price") is not None and since is not None and changed > since:
+            previous = float(row["previous_price"])
+            for period in _periods(period_of, since, changed):
+                at = datetime.combine(period, datetime.min.time(), timezone.utc)
+                add((row["normalized_name"], row["store"], period.isoformat()), previous, at)
+
+        price = float(row["price"])
+        periods = _periods(period_of, start, last_seen)
+        for period in periods:
+            at = last_seen if period == periods[-1] else max(
+                changed, datetime.combine(period, datetime.min.time(), timezone.utc)
+            )
+            add((row["normalized_name"], row["store"], period.isoformat()), price, at)
+    return buckets
+
+def _fetch_existing(client, table, buckets):
+    """Linhas já agregadas dos produtos e períodos tocados por este bloco."""
+    periods = [period for _, _, period in buckets]
+    names = sorted({name for name, _, _ in buckets})
+    existing = {}
+    for i in range(0, len(names), NAMES_PER_QUERY):
+        start = 0
+        while True:
+            page = (
+                client.table(table)
+                .select("*")
+                .in_("normalized_name", names[i:i + NAMES_PER_QUERY])
+                .gte("period_start", min(periods))
+                .lte("period_start", max(periods))
+                # Ordenado pela chave primária: sem ordem as páginas podem pular linhas
+                .order("normalized_name").order("store").order("period_start")
+                .range(start, start + PAGE_SIZE - 1)
+                .execute()
+                .data
+            )
+            for row in page:
+                key = (row["normalized_name"], row["store"], row["period_start"])
+                if key in buckets:
+                    existing[key] = row
+            if len(page) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+    return existing
+
+def merge_rows(buckets, existing):
+    """
+    Combina os agregados novos com os já gravados.
+
+    Returns:
+        list: Linhas para upsert na tabela de agregados
+    """
+    rows = []
+    for (normalized_name, store, period), bucket in buckets.items():
+        samples = bucket["samples"]
+        total = bucket["sum"]
+        row = {
+            "normalized_name": normalized_name,
+            "store": store,
+            "period_start": period,
+            "min_price": bucket["min_price"],
+            "max_price": bucket["max_price"],
+            "last_price": bucket["last_price"],
+            "last_at": bucket["last_at"].isoformat(),
+        }
+
+        old = existing.get((normalized_name, store, period))
+        if old:
+            old_samples = old["samples"] or 0
+            total += float(old["mean_price"]) * old_samples
+            samples += old_samples
+            row["min_price"] = min(row["min_price"], float(old["min_price"]))
+            row["max_price"] = max(row["max_price"], float(old["max_price"]))
+            if old.get("last_at") and _parse_timestamp(old["last_at"]) > bucket["last_at"]:
+                row["last_price"] = float(old["last_price"])
+                row["last_at"] = old["last_at"]
+
+        row["samples"] = samples
+        # Período só com o preço em vigor (carry_forward): sem pontos para a média
+        row["mean_price"] = round(total / samples, 4) if samples else row["last_price"]
+        rows.append(row)
+    return rows
+
+def update_rollups(client=None, chunk_size=ROLLUP_CHUNK):
+    """
+    Agrega os registros novos de price_history.
+
+    Returns:
+        int: Quantidade de registros processados
+    """
+    client = client or get_supabase_client()
+    if not client:
+        return 0
+
+    watermarks = get_watermarks(client)
+    processed = 0
+    while True:
+        rows = fetch_new_rows(client, min(watermarks.values()), chunk_size)
+        if not rows:
+            break
+
+        for table, period_of in PERIODS.items():
+            # Uma tabela pode estar à frente da outra (falha no meio de um bloco)
+            pending = [row for row in rows if row["id"] > watermarks[table]]
+            buckets = aggregate(pending, period_of)
+            if buckets:
+                merged = merge_rows(buckets, _fetch_existing(client, table, buckets))
+                # Um único upsert por bloco: ou o bloco entra inteiro ou nada muda
+                client.table(table).upsert(
+                    merged, on_conflict="normalized_name,store,period_start"
+                ).execute()
+            if pending:
+                watermarks[table] = pending[-1]["id"]
+                set_watermark(client, table, watermarks[table])
+
+        processed += len(rows)
+        print(f"Agregados: {processed} registros processados (até id {rows[-1]['id']}).")
+
+        if len(rows) < chunk_size:
+            break
+
+    now = datetime.now(timezone.utc)
+    for table, period_of in PERIODS.items():
+        since = get_carry_since(client, table)
+        buckets = carry_forward(fetch_latest_seen(client, since), period_of, since, now)
+        if buckets:
+            merged = merge_rows(buckets, _fetch_existing(client, table, buckets))
+            # Levar o preço adiante de novo não muda nada: um bloco que falhar
+            # é refeito inteiro na próxima execução
+            for i in range(0, len(merged), PAGE_SIZE):
+                client.table(table).upsert(
+                    merged[i:i + PAGE_SIZE], on_conflict="normalized_name,store,period_start"
+                ).execute()
+        set_carry_since(client, table, now)
+        print(f"Agregados: preço em vigor levado adiante em {len(buckets)} períodos de {table}.")
+
+    return processed
+
+if __name__ == "__main__":
+    total = update_rollups()
+    print(f"Agregados atualizados. {total} registros novos.")
@@ -0,0 +1,155 @@
+"""
+Arquivo JSON Lines de Cada Execução
+
+Cada execução do main_scraper.py grava um arquivo próprio em ARCHIVE_DIR
+(`run-<início>-<run_id>.jsonl`, ou `.jsonl.gz` com ARCHIVE_COMPRESS=1),
+só acrescentando linhas:
+
+    {"type": "run", "run_id": ..., "mode": ..., "queries": [...], "started_at": ...}
+    {"product_name": ..., "price": ..., "store": ..., "url": ..., "timestamp": ...}
+    ...
+    {"type": "run_end", "run_id": ..., "finished_at": ..., "duration_s": ..., "records": ...}
+
+Os produtos são gravados assim que cada loja termina (e o arquivo é
+descarregado no disco a cada lote), então uma queda perde no máximo a loja
+em andamento. O arquivo pode ser lido linha a linha e importado diretamente
+com `python import_json.py <arquivo>` (as linhas de cabeçalho são ignoradas
+e o `timestamp` de cada produto é mantido); sem argumentos, import_json.py
+importa o arquivo mais recente da pasta.
+
+ARCHIVE_KEEP limita quantas execuções ficam na pasta (0 = todas).
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+ARCHIVE_DIR = os.environ.get(
+    "ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "archive")
+)
+ARCHIVE_COMPRESS = os.environ.get("ARCHIVE_COMPRESS", "0") == "1"
+ARCHIVE_KEEP = int(os.environ.get("ARCHIVE_KEEP", "0"))
+
+# Valores de "type" das linhas que não são produtos
+META_TYPES = ("run", "run_end")
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+def list_archives(archive_dir=ARCHIVE_DIR):
+    """
+    Returns:
+        list: Nomes dos arquivos de execução em `archive_dir`, do mais antigo
+              ao mais recente (o nome começa pelo horário de início)
+    """
+    if not os.path.isdir(archive_dir):
+        return []
+    return sorted(
+        name for name in os.listdir(archive_dir)
+        if name.startswith("run-") and (name.endswith(".jsonl") or name.endswith(".jsonl.gz"))
+    )
+
+def latest_archive(archive_dir=ARCHIVE_DIR):
+    """
+    Returns:
+        str: Caminho do arquivo da execução mais recente (None se não houver)
+    """
+    runs = list_archives(archive_dir)
+    return os.path.join(archive_dir, runs[-1]) if runs else None
+
+class RunArchive:
+    """Arquivo JSON Lines (append-only) de uma execução."""
+
+    def __init__(self, queries, mode, run_id=None, archive_dir=ARCHIVE_DIR,
+                 compress=ARCHIVE_COMPRESS, keep=ARCHIVE_KEEP):
+        """
+        Args:
+            queries (list): Termos de busca da execução
+            mode (str): Modo de orquestração (serial, async, process)
+            run_id (int, optional): ID da execução em scrape_runs (ver runs.py)
+            archive_dir (str): Pasta dos arquivos
+            compress (bool): Gravar em gzip (.jsonl.gz)
+            keep (int): Execuções mantidas na pasta (0 = todas)
+        """
+        self.queries = list(queries)
+        self.mode = mode
+        self.run_id = run_id
+        self.archive_dir = archive_dir
+        self.compress = compress
+        self.keep = keep
+        self.records = 0
+        self.path = None
+        self._file = None
+        self._started = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        started_at = datetime.now(timezone.utc)
+        name = f"run-{started_at:%Y%m%dT%H%M%SZ}-{self.run_id or 'local'}.jsonl"
+        self.path = os.path.join(self.archive_dir, name + (".gz" if self.compress else ""))
+
+        if self.compress:
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._started = time.monotonic()
+
+        self._write_line({
+            "type": "run",
+            "run_id": self.run_id,
+            "mode": self.mode,
+            "queries": self.queries,
+            "started_at": started_at.isoformat(),
+        })
+        self._file.flush()
+        self._rotate()
+        return self
+
+    def write(self, records):
+        """Acrescenta produtos (com o horário da coleta) e descarrega no disco."""
+        if self._file is None:
+            self.open()
+        timestamp = _now()
+        with self._lock:
+            for record in records:
+                self._write_line({**record, "timestamp": record.get("timestamp") or timestamp})
+            self.records += len(records)
+            # Em gzip, flush fecha um bloco: o arquivo continua legível após uma queda
+            self._file.flush()
+
+    def close(self, status="completed"):
+        if self._file is None:
+            return
+        with self._lock:
+            self._write_line({
+                "type": "run_end",
+                "run_id": self.run_id,
+                "status": status,
+                "finished_at": _now(),
+                "duration_s": round(time.monotonic() - self._started, 1),
+                "records": self.records,
+            })
+            self._file.close()
+            self._file = None
+        print(f"Execução arquivada em {self.path} ({self.records} registros).")
+
+    def _write_line(self, data):
+        self._file.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+    def _rotate(self):
+        """Remove os arquivos de execuções mais antigas além de `keep`."""
+        if self.keep <= 0:
+            return
+        for name in list_archives(self.archive_dir)[:-self.keep]:
+            os.remove(os.path.join(self.archive_dir, name))
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close("failed" if exc_type else "completed")
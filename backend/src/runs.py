@@ -0,0 +1,67 @@
+"""
+Execuções do Scraper
+
+Cada execução do main_scraper.py é registrada em `scrape_runs` e os registros
+salvos durante ela levam o `run_id` (em price_history e price_latest). O
+"retrato atual" de uma execução é então uma consulta por índice:
+
+    select * from price_latest where run_id = <última execução concluída>
+"""
+
+from datetime import datetime, timezone
+
+_current_run_id = None
+
+def start_run(client, mode):
+    """
+    Registra o início de uma execução.
+
+    Args:
+        client: Cliente Supabase
+        mode (str): Modo de orquestração (serial, async, process)
+
+    Returns:
+        int: ID da execução, ou None se não foi possível registrar
+             (ex: migração ainda não aplicada); nesse caso os registros
+             são salvos sem run_id
+    """
+    global _current_run_id
+    if client is None:
+        return None
+    try:
+        row = client.table("scrape_runs").insert({"mode": mode, "status": "running"}).execute().data[0]
+    except Exception as e:
+        print(f"Aviso: não foi possível registrar a execução ({e}).")
+        return None
+    _current_run_id = row["id"]
+    print(f"Execução {_current_run_id} iniciada.")
+    return _current_run_id
+
+def finish_run(client, run_id, products, status="completed"):
+    """
+    Registra o fim de uma execução.
+
+    Args:
+        client: Cliente Supabase
+        run_id (int): ID retornado por `start_run`
+        products (int): Total de produtos coletados
+        status (str): "completed" ou "failed"
+    """
+    global _current_run_id
+    if run_id is None:
+        return
+    try:
+        client.table("scrape_runs").update({
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "status": status,
+            "products": products,
+        }).eq("id", run_id).execute()
+    except Exception as e:
+        print(f"Aviso: não foi possível finalizar a execução {run_id} ({e}).")
+    finally:
+        if _current_run_id == run_id:
+            _current_run_id = None
+
+def current_run_id():
+    """ID da execução em andamento neste processo (ou None)."""
+    return _current_run_id
@@ -0,0 +1,152 @@
+"""
+Agendador com Rate Limit por Domínio
+
+Expande termos × lojas em jobs individuais e os despacha respeitando um token
+bucket por loja (intervalo mínimo, burst e jitter configuráveis em
+stores.RATE_LIMITS). Enquanto uma loja está "esfriando", o job de outra loja
+roda, então a polidez por domínio se mantém sem a espera global dos sleeps fixos.
+"""
+
+import asyncio
+import inspect
+import random
+import threading
+import time
+from stores import SCRAPERS, RATE_LIMITS, DEFAULT_RATE_LIMIT, run_store
+
+class TokenBucket:
+    """
+    Token bucket simples: `burst` requisições imediatas e depois uma a cada
+    `min_interval` segundos, com até `jitter` segundos aleatórios a mais.
+    """
+
+    def __init__(self, min_interval, burst=1, jitter=0.0):
+        self.min_interval = float(min_interval)
+        self.burst = max(1, int(burst))
+        self.jitter = float(jitter)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Reserva um token.
+
+        Returns:
+            float: Segundos que o chamador deve esperar antes da requisição
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.min_interval > 0:
+                refill = (now - self._updated) / self.min_interval
+                self._tokens = min(self.burst, self._tokens + refill)
+            else:
+                self._tokens = self.burst
+            self._updated = now
+
+            # Tokens negativos representam reservas já feitas para o futuro
+            self._tokens -= 1
+            wait = 0.0
+            if self._tokens < 0:
+                wait = -self._tokens * self.min_interval
+
+        if wait > 0 and self.jitter > 0:
+            wait += random.uniform(0, self.jitter)
+        return wait
+
+class DomainRateLimiter:
+    """Um TokenBucket por loja, criado sob demanda a partir de RATE_LIMITS."""
+
+    def __init__(self, limits=None):
+        self.limits = RATE_LIMITS if limits is None else limits
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, store_name):
+        with self._lock:
+            if store_name not in self._buckets:
+                config = {**DEFAULT_RATE_LIMIT, **self.limits.get(store_name, {})}
+                self._buckets[store_name] = TokenBucket(**config)
+            return self._buckets[store_name]
+
+    def acquire(self, store_name):
+        """Bloqueia a thread atual até a loja liberar uma requisição."""
+        wait = self.bucket(store_name).reserve()
+        if wait > 0:
+            print(f"[{store_name}] Aguardando {wait:.2f}s (rate limit)...")
+            time.sleep(wait)
+
+    async def acquire_async(self, store_name):
+        """Versão asyncio de `acquire` (não bloqueia as outras lojas)."""
+        wait = self.bucket(store_name).reserve()
+        if wait > 0:
+            print(f"[{store_name}] Aguardando {wait:.2f}s (rate limit)...")
+            await asyncio.sleep(wait)
+
+def build_jobs(queries, scrapers=None):
+    """
+    Expande termos × lojas em jobs individuais.
+
+    Returns:
+        list: [{"query": str, "store": str, "scraper": callable}, ...]
+              na ordem termo → loja (a mesma do modo serial)
+    """
+    scrapers = SCRAPERS if scrapers is None else scrapers
+    return [
+        {"query": query, "store": store_name, "scraper": scraper}
+        for query in queries
+        for store_name, scraper in scrapers
+    ]
+
+async def run_jobs_async(jobs, workers, limiter=None, on_result=None, keep_results=True):
+    """
+    Executa os jobs nos BrowserWorkers respeitando o rate limit de cada loja.
+
+    Cada loja processa os seus jobs em sequência (no máximo uma requisição em
+    andamento por domínio); lojas diferentes rodam em paralelo, limitadas pelo
+    número de workers.
+
+    Args:
+        jobs (list): Jobs de `build_jobs`
+        workers (BrowserWorkers): Workers com navegador próprio
+        limiter (DomainRateLimiter, optional): Rate limit por loja
+        on_result (callable, optional): Chamado com (job, produtos) a cada job
+            concluído; se for uma corrotina, a fila da loja espera por ela
+        keep_results (bool): Guardar os produtos para o retorno (False quando
+            `on_result` já os consome, para não manter a varredura em memória)
+
+    Returns:
+        list: Lista de produtos de cada job, na mesma ordem de `jobs`
+    """
+    limiter = limiter or DomainRateLimiter()
+    results = [[] for _ in jobs]
+
+    by_store = {}
+    for index, job in enumerate(jobs):
+        by_store.setdefault(job["store"], []).append(index)
+
+    async def run_store_queue(store_name, indexes):
+        for index in indexes:
+            job = jobs[index]
+            await limiter.acquire_async(store_name)
+            print(f"\n[{store_name}] Executando '{job['query']}'...")
+            try:
+                future = workers.submit(run_store, store_name, job["scraper"], job["query"])
+                store_data = await asyncio.wrap_future(future)
+            except Exception as e:
+                print(f"Erro no scraper {store_name} ('{job['query']}'): {e}")
+                continue
+
+            print(f"-> {store_name} ('{job['query']}'): {len(store_data)} produtos encontrados.")
+            if keep_results:
+                results[index] = store_data
+            if on_result:
+                result = on_result(job, store_data)
+                if inspect.isawaitable(result):
+                    await result
+
+    await asyncio.gather(*[
+        run_store_queue(store_name, indexes)
+        for store_name, indexes in by_store.items()
+    ])
+    return results
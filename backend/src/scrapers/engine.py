@@ -0,0 +1,198 @@
+"""
+Motor Genérico de Scraping
+
+Executa qualquer loja descrita em scrapers/specs.py: monta a URL, tenta o fast
+path HTTP, abre a página (snapshots, goto, espera adaptativa), extrai todos
+os cartões em lote e converte em produtos. Otimizações feitas aqui valem para
+todas as lojas.
+"""
+
+import json
+import random
+import sys
+import os
+import time
+from contextlib import ExitStack
+from functools import partial
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from product_filter import is_valid_pc_product
+from browser_pool import scraper_context
+from scrapers.extraction import extract_cards, parse_brl_price
+from scrapers.readiness import wait_for_cards
+from scrapers.snapshots import prepare_page, save_snapshot
+from scrapers.fast_path import fetch_cards
+from scrapers.specs import SPECS_BY_NAME
+
+def build_url(spec, query, page_num=1):
+    """Monta a URL de busca a partir do modelo da loja."""
+    term = query
+    if spec.get("query_separator"):
+        term = term.replace(" ", spec["query_separator"])
+    if spec.get("query_lower"):
+        term = term.lower()
+    return spec["url"].format(query=term, page=page_num)
+
+def parse_cards(spec, product_cards):
+    """
+    Converte os cartões extraídos (navegador ou HTTP) em produtos.
+
+    Args:
+        spec (dict): Definição da loja
+        product_cards (list): Cartões de `extract_cards` / `fetch_cards`
+
+    Returns:
+        list: [{"product_name", "price", "store", "url"}, ...]
+    """
+    products = []
+
+    for card in product_cards:
+        try:
+            title = card["title"] or spec.get("default_title")
+            if not title:
+                continue
+
+            # Filtrar produtos não relacionados a PC
+            if spec.get("filter", True) and not is_valid_pc_product(title):
+                continue
+
+            if len(title) < spec.get("min_title_length", 0):
+                continue
+
+            if card["price"] is None:
+                continue
+
+            # Limpeza do preço "R$ 3.399,00" -> 3399.00
+            price_text = card["price"]
+            for token in spec.get("price_strip", []):
+                price_text = price_text.replace(token, "")
+            price_float = parse_brl_price(price_text)
+
+            # Só adicionar produtos com preço válido
+            if price_float <= 0:
+                continue
+
+            # Link
+            item_url = card["href"]
+            if item_url:
+                if spec.get("strip_query"):
+                    item_url = item_url.split('?')[0]  # Remove tracking params
+                if not item_url.startswith("http"):
+                    item_url = spec["base_url"] + item_url
+
+            products.append({
+                "product_name": title,
+                "price": price_float,
+                "store": spec["name"],
+                "url": item_url
+            })
+
+        except Exception as e:
+            # print(f"Erro ao processar um cartão: {e}")
+            continue
+
+    return products
+
+def _browser_cards(spec, page, url, query, page_num):
+    """Carrega a busca no navegador e lê todos os cartões de uma vez."""
+    # Snapshots: em replay serve a página salva, em record captura JSONs
+    if not prepare_page(page, spec["name"], query, page_num):
+        return []
+
+    # Usar domcontentloaded ao invés de networkidle (mais rápido)
+    timeout = spec.get("goto_timeout", 60000)
+    try:
+        page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    except Exception as goto_err:
+        if not spec.get("retry_load"):
+            raise
+        print(f"Erro no page.goto (tentando load): {goto_err}")
+        page.goto(url, wait_until="load", timeout=timeout)
+
+    # Aguardar os cards e rolar até pararem de aparecer novos
+    print("Aguardando carregamento dos produtos...")
+    if not wait_for_cards(page, spec["card"]["card"], **spec.get("wait", {})):
+        print("Timeout aguardando seletores de produto.")
+
+    save_snapshot(page, spec["name"], query, page_num)
+
+    # Ler todos os cartões de uma vez (uma única chamada ao navegador)
+    return extract_cards(page, spec["card"])
+
+def scrape_store(spec, query="RTX 4060", context=None, max_pages=None, context_factory=None):
+    """
+    Busca `query` em uma loja descrita por `spec`.
+
+    Args:
+        spec (dict): Definição da loja (ver scrapers/specs.py)
+        query (str): Termo de busca
+        context (BrowserContext, optional): Contexto injetado pelo BrowserPool
+        max_pages (int, optional): Sobrescreve o `max_pages` da loja
+        context_factory (callable, optional): Cria o contexto só se o fast
+            path não resolver (ver stores.run_store)
+
+    Returns:
+        list: Produtos encontrados
+    """
+    store_name = spec["name"]
+    max_pages = max_pages or spec.get("max_pages", 1)
+    products = []
+
+    # O navegador só é aberto se o fast path não resolver
+    with ExitStack() as stack:
+        page = None
+
+        for page_num in range(1, max_pages + 1):
+            url = build_url(spec, query, page_num)
+            label = f" (página {page_num}/{max_pages})" if max_pages > 1 else ""
+
+            try:
+                page_products = []
+                if spec.get("fast_path"):
+                    # Loja renderizada no servidor: tentar antes uma requisição HTTP simples
+                    print(f"Buscando {url} via HTTP{label}...")
+                    product_cards = fetch_cards(url, spec["card"], store_name, query, page_num)
+                    if product_cards:
+                        page_products = parse_cards(spec, product_cards)
+                        if page_products:
+                            print(f"Encontrados {len(product_cards)} cartões de produto (fast path HTTP).")
+
+                if not page_products:
+                    if page is None:
+                        browser_context = stack.enter_context(scraper_context(context, context_factory))
+                        page = browser_context.new_page()
+                        stack.callback(page.close)
+
+                    print(f"Buscando {url} com Playwright{label}...")
+                    product_cards = _browser_cards(spec, page, url, query, page_num)
+                    if not product_cards:
+                        print(f"Nenhum produto encontrado{label}.")
+                        break
+
+                    print(f"Encontrados {len(product_cards)} cartões de produto.")
+                    page_products = parse_cards(spec, product_cards)
+
+            except Exception as e:
+                print(f"Erro geral no scraper {store_name}{label}: {e}")
+                break
+
+            products.extend(page_products)
+
+            if page_num < max_pages and spec.get("page_delay"):
+                delay = random.uniform(*spec["page_delay"])
+                print(f"  Aguardando {delay:.1f}s antes da próxima página...")
+                time.sleep(delay)
+
+    if max_pages > 1:
+        print(f"Total de produtos coletados ({store_name}): {len(products)}")
+    return products
+
+def make_scraper(spec):
+    """Função `scraper(query, context=None, context_factory=None)` de uma loja (usada em stores.SCRAPERS)."""
+    return partial(scrape_store, spec)
+
+if __name__ == "__main__":
+    store = sys.argv[1] if len(sys.argv) > 1 else "Kabum"
+    query = sys.argv[2] if len(sys.argv) > 2 else "RTX 4060"
+    data = scrape_store(SPECS_BY_NAME[store], query)
+    print(f"\n--- Dados Extraídos ({store}) ---")
+    print(json.dumps(data, indent=4, ensure_ascii=False))
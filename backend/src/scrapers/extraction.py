@@ -0,0 +1,112 @@
+"""
+Extração em Lote dos Cartões de Produto
+
+Em vez de um locator por campo de cada cartão (cada `count()`, `inner_text()`
+e `get_attribute()` é uma ida e volta ao navegador), toda a página é lida com
+um único `page.evaluate`, que devolve título, preço e link de todos os cartões.
+
+A especificação dos cartões de cada loja ("card" em scrapers/specs.py) usa
+listas de seletores em ordem de preferência, preservando os fallbacks que os
+scrapers já tinham:
+
+    {
+        "card": "article.productCard",
+        "title": [".nameCard", 'span[class*="nameCard"]'],
+        "price": [".priceCard", {"whole": "...", "fraction": "..."}],
+        "price_contains": "R$",      # opcional: primeiro texto que contém isso
+        "link": ["a.productLink"],   # None = href do próprio cartão
+    }
+"""
+
+# Para cada cartão, o primeiro seletor com resultado vence (mesma lógica dos
+# `if not locator.count(): locator = card.locator(fallback)` antigos)
+EXTRACT_CARDS_JS = """
+(spec) => {
+    const firstMatch = (root, selectors) => {
+        for (const sel of selectors || []) {
+            const found = root.querySelectorAll(sel);
+            if (found.length) return Array.from(found);
+        }
+        return [];
+    };
+
+    const readPrice = (card) => {
+        for (const sel of spec.price || []) {
+            if (typeof sel === 'object') {
+                // Preço montado de duas partes (ex: Amazon a-price-whole + a-price-fraction)
+                const whole = card.querySelector(sel.whole);
+                const fraction = card.querySelector(sel.fraction);
+                if (whole && fraction) {
+                    return `${whole.innerText.trim()},${fraction.innerText.trim()}`;
+                }
+                continue;
+            }
+
+            const found = card.querySelectorAll(sel);
+            if (!found.length) continue;
+
+            if (spec.price_contains) {
+                const match = Array.from(found).find(el => el.innerText.includes(spec.price_contains));
+                return match ? match.innerText : null;
+            }
+            return found[0].innerText;
+        }
+        return null;
+    };
+
+    return Array.from(document.querySelectorAll(spec.card)).map(card => {
+        try {
+            const titles = firstMatch(card, spec.title);
+            let href = null;
+            if (spec.link) {
+                const links = firstMatch(card, spec.link);
+                href = links.length ? links[0].getAttribute('href') : null;
+            } else {
+                href = card.getAttribute('href');
+            }
+
+            return {
+                title: titles.length ? titles[0].innerText : null,
+                price: readPrice(card),
+                href: href
+            };
+        } catch (e) {
+            return null;
+        }
+    }).filter(Boolean);
+}
+"""
+
+def extract_cards(page, spec):
+    """
+    Lê todos os cartões da página em uma única chamada ao navegador.
+
+    Args:
+        page (Page): Página já carregada
+        spec (dict): Seletores da loja (ver docstring do módulo)
+
+    Returns:
+        list: [{"title": str|None, "price": str|None, "href": str|None}, ...]
+              com textos já sem espaços nas pontas
+    """
+    cards = page.evaluate(EXTRACT_CARDS_JS, spec)
+    for card in cards:
+        for field in ("title", "price"):
+            if card[field] is not None:
+                card[field] = card[field].strip()
+    return cards
+
+def parse_brl_price(price_text):
+    """
+    Converte um preço em formato brasileiro para float.
+
+    Exemplo: "R$ 3.399,00" -> 3399.0 (0.0 se não for possível converter)
+    """
+    price_clean = price_text.replace("R$", "").replace(".", "").replace(",", ".").strip()
+    # Manter apenas digitos e ponto
+    price_clean = "".join(c for c in price_clean if c.isdigit() or c == '.')
+
+    try:
+        return float(price_clean)
+    except ValueError:
+        return 0.0
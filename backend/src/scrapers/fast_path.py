@@ -0,0 +1,220 @@
+"""
+Fast Path HTTP
+
+Para lojas que renderizam a busca no servidor, baixa a página com uma
+requisição HTTP comum (sessão keep-alive reaproveitada) e lê os cartões com o
+mesmos seletores usados no navegador. Se o HTML não tiver cartões, tenta o JSON
+embutido (schema.org JSON-LD). Retorna None quando não encontra nada ou quando
+detecta bloqueio/CAPTCHA, e então o scraper segue para o Playwright.
+
+SCRAPER_HTTP_FAST_PATH=0 desliga o fast path em todas as lojas.
+"""
+
+import json
+import os
+import sys
+import threading
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from browser_pool import USER_AGENT, CONTEXT_OPTIONS
+from scrapers.snapshots import SNAPSHOT_MODE, save_http_snapshot
+
+HTTP_FAST_PATH = os.environ.get("SCRAPER_HTTP_FAST_PATH", "1") != "0"
+
+REQUEST_TIMEOUT = 15
+
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    **CONTEXT_OPTIONS["extra_http_headers"],
+}
+
+# Status e trechos de página que indicam bloqueio anti-bot
+BLOCK_STATUS = {403, 429, 503}
+BLOCK_MARKERS = [
+    "captcha",
+    "are you a robot",
+    "não é um robô",
+    "acesso negado",
+    "access denied",
+    "request blocked",
+]
+
+_local = threading.local()
+
+def get_session():
+    """Sessão HTTP da thread atual (conexões keep-alive reaproveitadas entre buscas)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 504])
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _local.session = session
+    return session
+
+def is_block_page(status_code, html):
+    if status_code in BLOCK_STATUS:
+        return True
+    text = html.lower()
+    return any(marker in text for marker in BLOCK_MARKERS)
+
+def _text(element):
+    # Equivalente aproximado ao innerText: espaços colapsados
+    return " ".join(element.get_text(" ").split())
+
+def _first_match(root, selectors):
+    for selector in selectors or []:
+        found = root.select(selector)
+        if found:
+            return found
+    return []
+
+def _read_price(card, spec):
+    for selector in spec.get("price") or []:
+        if isinstance(selector, dict):
+            whole = card.select_one(selector["whole"])
+            fraction = card.select_one(selector["fraction"])
+            if whole and fraction:
+                return f"{_text(whole)},{_text(fraction)}"
+            continue
+
+        found = card.select(selector)
+        if not found:
+            continue
+
+        if spec.get("price_contains"):
+            for element in found:
+                text = _text(element)
+                if spec["price_contains"] in text:
+                    return text
+            return None
+        return _text(found[0])
+    return None
+
+def parse_cards_html(html, spec):
+    """
+    Lê os cartões de um HTML estático com os mesmos seletores do navegador.
+
+    Returns:
+        list: Mesmo formato de `extraction.extract_cards`
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for card in soup.select(spec["card"]):
+        titles = _first_match(card, spec.get("title"))
+        if spec.get("link"):
+            links = _first_match(card, spec["link"])
+            href = links[0].get("href") if links else None
+        else:
+            href = card.get("href")
+
+        cards.append({
+            "title": _text(titles[0]) if titles else None,
+            "price": _read_price(card, spec),
+            "href": href,
+        })
+    return cards
+
+def _iter_json_ld_products(node):
+    if isinstance(node, list):
+        for item in node:
+            yield from _iter_json_ld_products(item)
+    elif isinstance(node, dict):
+        if node.get("@type") == "Product":
+            yield node
+        for key in ("@graph", "itemListElement", "item"):
+            if key in node:
+                yield from _iter_json_ld_products(node[key])
+
+def parse_cards_json_ld(html):
+    """
+    Lê produtos do JSON-LD (schema.org Product/ItemList) embutido na página.
+
+    Returns:
+        list: Mesmo formato de `extraction.extract_cards`
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for script in soup.select('script[type="application/ld+json"]'):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+
+        for product in _iter_json_ld_products(data):
+            offers = product.get("offers") or {}
+            if isinstance(offers, list):
+                offers = offers[0] if offers else {}
+            price = offers.get("price", offers.get("lowPrice"))
+            if price is None:
+                continue
+
+            try:
+                # Converter para o formato brasileiro esperado por parse_brl_price
+                price_text = f"{float(price):.2f}".replace(".", ",")
+            except (TypeError, ValueError):
+                continue
+
+            cards.append({
+                "title": product.get("name"),
+                "price": price_text,
+                "href": product.get("url") or offers.get("url"),
+            })
+    return cards
+
+def fetch_cards(url, spec, store=None, query=None, page_num=1):
+    """
+    Tenta obter os cartões sem navegador.
+
+    Args:
+        url (str): URL da busca
+        spec (dict): Seletores dos cartões da loja ("card" em specs.py)
+        store, query, page_num: Identificação da busca para os snapshots
+
+    Returns:
+        list | None: Cartões encontrados, ou None para cair no Playwright
+    """
+    # Em replay nada sai para a rede: o snapshot é servido ao navegador
+    if not HTTP_FAST_PATH or SNAPSHOT_MODE == "replay":
+        return None
+
+    try:
+        response = get_session().get(url, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Fast path HTTP falhou ({e}), usando Playwright...")
+        return None
+
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = response.apparent_encoding
+
+    html = response.text
+    if store and query:
+        save_http_snapshot(html, store, query, page_num)
+        if SNAPSHOT_MODE == "record":
+            # Seguir para o navegador para gravar também a página renderizada
+            return None
+
+    if response.status_code in BLOCK_STATUS:
+        print(f"Fast path HTTP bloqueado (status {response.status_code}), usando Playwright...")
+        return None
+
+    # Uma página com cartões não é página de bloqueio, mesmo que carregue
+    # scripts de CAPTCHA; os marcadores só são checados quando não há cartões
+    cards = parse_cards_html(html, spec) or parse_cards_json_ld(html)
+    if not cards:
+        if is_block_page(response.status_code, html):
+            print("Fast path HTTP caiu em página de bloqueio/CAPTCHA, usando Playwright...")
+        else:
+            print("Fast path HTTP sem cartões (página renderizada no cliente), usando Playwright...")
+        return None
+
+    return cards
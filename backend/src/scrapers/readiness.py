@@ -0,0 +1,73 @@
+"""
+Detecção Adaptativa de Carregamento
+
+Substitui os `time.sleep` fixos dos scrapers: espera o primeiro cartão
+aparecer e então rola a página aos poucos, parando assim que novas rolagens
+não trazem mais cartões (ou quando a condição "pronto" da loja é satisfeita).
+Todo o laço de rolagem roda dentro do navegador, em uma única chamada.
+"""
+
+# Rola `step` pixels, espera `interval` ms e conta os cartões; para depois de
+# `stableRounds` rodadas sem cartões novos, quando `doneSelector` já aparece
+# uma vez por cartão (ex: preço renderizado em todos) ou ao atingir `maxMs`
+SETTLE_CARDS_JS = """
+async ({selector, step, interval, stableRounds, maxMs, doneSelector}) => {
+    const count = () => document.querySelectorAll(selector).length;
+    const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+    const isDone = (cards) => doneSelector &&
+        document.querySelectorAll(doneSelector).length >= cards;
+
+    const start = performance.now();
+    let last = count();
+    let stable = 0;
+
+    while (performance.now() - start < maxMs) {
+        if (isDone(last)) break;
+
+        window.scrollBy(0, step);
+        await sleep(interval);
+
+        const current = count();
+        if (current > last) {
+            last = current;
+            stable = 0;
+        } else if (++stable >= stableRounds) {
+            break;
+        }
+    }
+    return last;
+}
+"""
+
+def wait_for_cards(page, card_selector, timeout=20000, max_wait=15000,
+                   step=800, interval=500, stable_rounds=2, done_selector=None):
+    """
+    Espera os cartões de produto carregarem, sem pausas fixas.
+
+    Args:
+        page (Page): Página após o `goto`
+        card_selector (str): Seletor dos cartões da loja
+        timeout (int): Máximo (ms) para o primeiro cartão aparecer
+        max_wait (int): Limite (ms) do laço de rolagem incremental
+        step (int): Pixels por rolagem
+        interval (int): Espera (ms) entre rolagens
+        stable_rounds (int): Rodadas sem cartões novos para considerar pronto
+        done_selector (str, optional): Condição de "pronto" da loja: a página
+            está pronta quando este seletor aparece ao menos uma vez por cartão
+
+    Returns:
+        int: Cartões na página (0 se nenhum apareceu dentro de `timeout`)
+    """
+    try:
+        page.wait_for_selector(card_selector, timeout=timeout)
+    except Exception:
+        return 0
+
+    return page.evaluate(SETTLE_CARDS_JS, {
+        "selector": card_selector,
+        "step": step,
+        "interval": interval,
+        "stableRounds": stable_rounds,
+        "maxMs": max_wait,
+        "doneSelector": done_selector,
+    })
@@ -0,0 +1,144 @@
+"""
+Gravação e Replay de Páginas (Snapshots)
+
+Permite rodar os scrapers sem acessar as lojas, para medir e depurar a
+extração de forma determinística.
+
+SCRAPER_SNAPSHOT_MODE:
+    record - salva o HTML renderizado de cada busca (e as respostas JSON
+             recebidas pela página) em SCRAPER_SNAPSHOT_DIR
+    replay - serve os snapshots salvos ao mesmo código dos scrapers via
+             roteamento de requisições; nada sai para a rede
+
+Estrutura (uma pasta por loja e termo):
+    <dir>/<loja>/<termo>/page-1.html       HTML renderizado após o carregamento
+    <dir>/<loja>/<termo>/page-1.json       metadados (URL, data, respostas JSON)
+    <dir>/<loja>/<termo>/http-1.html       HTML bruto do fast path HTTP
+    <dir>/<loja>/<termo>/responses/*.json  corpos das respostas JSON
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+import weakref
+from datetime import datetime
+
+SNAPSHOT_MODE = os.environ.get("SCRAPER_SNAPSHOT_MODE", "")
+
+SNAPSHOT_DIR = os.environ.get(
+    "SCRAPER_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "fixtures", "snapshots")
+)
+
+# Respostas recebidas por cada página em gravação (até o save_snapshot)
+_recorded_responses = weakref.WeakKeyDictionary()
+
+# Scripts executáveis são removidos no replay (o HTML já está renderizado e
+# reexecutar o React apagaria/alteraria os cartões); JSON embutido é mantido
+EXECUTABLE_SCRIPT_RE = re.compile(
+    r'<script(?![^>]*type="application/(?:ld\+)?json")[^>]*>.*?</script>',
+    re.IGNORECASE | re.DOTALL
+)
+
+def slugify(text):
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+def snapshot_dir(store, query):
+    return os.path.join(SNAPSHOT_DIR, slugify(store), slugify(query))
+
+def _response_file(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json"
+
+def prepare_page(page, store, query, page_num=1):
+    """
+    Chamar antes do `page.goto`.
+
+    Em replay, roteia a página para o snapshot salvo; em record, começa a
+    guardar as respostas JSON para `save_snapshot`.
+
+    Returns:
+        bool: False se estiver em replay e não houver snapshot para esta busca
+    """
+    if SNAPSHOT_MODE == "record":
+        responses = []
+        page.on("response", responses.append)
+        _recorded_responses[page] = responses
+        return True
+
+    if SNAPSHOT_MODE != "replay":
+        return True
+
+    base = snapshot_dir(store, query)
+    html_path = os.path.join(base, f"page-{page_num}.html")
+    meta_path = os.path.join(base, f"page-{page_num}.json")
+    if not os.path.exists(html_path):
+        print(f"Snapshot não encontrado: {html_path}")
+        return False
+
+    with open(html_path, "r", encoding="utf-8") as f:
+        html = EXECUTABLE_SCRIPT_RE.sub("", f.read())
+
+    recorded = {}
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            recorded = {r["url"]: r["file"] for r in json.load(f).get("responses", [])}
+
+    def handle(route):
+        request = route.request
+        if request.is_navigation_request() and request.frame == page.main_frame:
+            return route.fulfill(status=200, content_type="text/html; charset=utf-8", body=html)
+        if request.url in recorded:
+            return route.fulfill(status=200, content_type="application/json", path=os.path.join(base, "responses", recorded[request.url]))
+        return route.abort()
+
+    page.route("**/*", handle)
+    return True
+
+def save_snapshot(page, store, query, page_num=1):
+    """Em record, salva o HTML renderizado e as respostas JSON da página."""
+    if SNAPSHOT_MODE != "record":
+        return
+
+    base = snapshot_dir(store, query)
+    os.makedirs(os.path.join(base, "responses"), exist_ok=True)
+
+    with open(os.path.join(base, f"page-{page_num}.html"), "w", encoding="utf-8") as f:
+        f.write(page.content())
+
+    saved = []
+    for response in _recorded_responses.pop(page, []):
+        if "json" not in response.headers.get("content-type", ""):
+            continue
+        try:
+            body = response.body()
+        except Exception:
+            # Respostas de redirecionamento ou já descartadas não têm corpo
+            continue
+        file_name = _response_file(response.url)
+        with open(os.path.join(base, "responses", file_name), "wb") as f:
+            f.write(body)
+        saved.append({"url": response.url, "file": file_name})
+
+    with open(os.path.join(base, f"page-{page_num}.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "store": store,
+            "query": query,
+            "url": page.url,
+            "recorded_at": datetime.now().isoformat(),
+            "responses": saved
+        }, f, indent=4, ensure_ascii=False)
+
+    print(f"Snapshot salvo em {base} ({len(saved)} respostas JSON)")
+
+def save_http_snapshot(html, store, query, page_num=1):
+    """Em record, salva o HTML bruto recebido pelo fast path HTTP."""
+    if SNAPSHOT_MODE != "record":
+        return
+
+    base = snapshot_dir(store, query)
+    os.makedirs(base, exist_ok=True)
+    with open(os.path.join(base, f"http-{page_num}.html"), "w", encoding="utf-8") as f:
+        f.write(html)
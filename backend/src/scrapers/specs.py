@@ -0,0 +1,176 @@
+"""
+Definições Declarativas das Lojas
+
+Cada loja é uma entrada de STORE_SPECS lida pelo motor genérico
+(scrapers/engine.py). Adicionar uma loja nova é adicionar uma entrada aqui.
+
+Campos:
+    name              Nome exibido (também é a chave dos snapshots)
+    url               Modelo da URL de busca: {query} e, se paginar, {page}
+    query_separator   Substitui os espaços do termo (None = termo como está)
+    query_lower       Termo em minúsculas na URL
+    card              Seletores dos cartões (formato de scrapers/extraction.py)
+    fast_path         Tentar antes o HTTP simples (loja renderizada no servidor)
+    goto_timeout      Timeout (ms) do page.goto
+    retry_load        Repetir o goto com wait_until="load" se falhar
+    wait              Parâmetros de readiness.wait_for_cards
+    max_pages         Páginas por busca (padrão 1)
+    page_delay        (mín, máx) segundos entre páginas
+    base_url          Prefixo dos links relativos
+    strip_query       Remover a query string (parâmetros de rastreio) do link
+    price_strip       Trechos removidos do preço antes da conversão
+    filter            Aplicar is_valid_pc_product no título (padrão True)
+    default_title     Título usado quando o cartão não tem título
+    min_title_length  Títulos menores que isso são ignorados
+    rate_limit        Rate limit da loja (ver scheduler.TokenBucket)
+    allow_urls        Trechos de URL nunca bloqueados (ver browser_pool.block_resources)
+"""
+
+STORE_SPECS = [
+    {
+        "name": "Kabum",
+        "url": "https://www.kabum.com.br/busca?q={query}",
+        "card": {
+            "card": "article.productCard",
+            "title": [".nameCard", 'span[class*="nameCard"]'],
+            # Preço à vista (geralmente .priceCard)
+            "price": [".priceCard", 'span[class*="priceCard"]'],
+            "link": ["a.productLink"],
+        },
+        "fast_path": True,
+        "goto_timeout": 60000,
+        # Kabum renderiza no servidor: pronto assim que todos os cards têm link
+        "wait": {"timeout": 15000, "done_selector": "article.productCard a.productLink"},
+        "base_url": "https://www.kabum.com.br",
+        "filter": False,
+        "default_title": "Produto Desconhecido",
+        "rate_limit": {"min_interval": 30, "jitter": 10},
+        "allow_urls": [],
+    },
+    {
+        "name": "Pichau",
+        "url": "https://www.pichau.com.br/search?q={query}",
+        # Os cards são os <a> dentro dos itens MuiGrid (o link é o próprio cartão)
+        "card": {
+            "card": 'div[class*="MuiGrid-item"] a[href*="/"]',
+            "title": ["h2"],
+            "price": ['div[class*="price_vista"]'],
+            "link": None,
+        },
+        "goto_timeout": 60000,
+        "retry_load": True,
+        "wait": {"timeout": 15000},
+        "base_url": "https://www.pichau.com.br",
+        "rate_limit": {"min_interval": 30, "jitter": 10},
+        "allow_urls": [],
+    },
+    {
+        "name": "Terabyte",
+        "url": "https://www.terabyteshop.com.br/busca?str={query}",
+        "card": {
+            "card": ".product-item",
+            "title": [".product-item__name h2"],
+            # div.prod-new-price span OU .product-item__new-price span
+            "price": [".prod-new-price span", ".product-item__new-price span"],
+            # Entre os spans de preço, usar o primeiro que contém "R$"
+            "price_contains": "R$",
+            "link": ["a.product-item__name"],
+        },
+        "fast_path": True,
+        "goto_timeout": 60000,
+        "retry_load": True,
+        "wait": {"timeout": 15000},
+        "base_url": "https://www.terabyteshop.com.br",
+        "rate_limit": {"min_interval": 30, "jitter": 10},
+        "allow_urls": [],
+    },
+    {
+        "name": "Mercado Livre",
+        "url": "https://lista.mercadolivre.com.br/{query}",
+        "query_separator": "-",
+        "card": {
+            "card": ".ui-search-layout__item",
+            "title": [".poly-component__title"],
+            # Preço atual (.poly-price__current); fallback para o seletor genérico
+            "price": [
+                ".poly-price__current .andes-money-amount__fraction",
+                ".andes-money-amount__fraction"
+            ],
+            "link": ["a.poly-component__title"],
+        },
+        "fast_path": True,
+        "goto_timeout": 90000,
+        # Mercado Livre já retorna URL completa (com parâmetros de rastreio)
+        "base_url": "https://www.mercadolivre.com.br",
+        "strip_query": True,
+        "rate_limit": {"min_interval": 40, "jitter": 15},
+        "allow_urls": [],
+    },
+    {
+        "name": "Amazon",
+        "url": "https://www.amazon.com.br/s?k={query}",
+        "query_separator": "+",
+        "card": {
+            "card": "div.s-result-item.s-asin",
+            "title": ["h2 span"],
+            # span.a-offscreen é mais confiável; fallback: a-price-whole + a-price-fraction
+            "price": [
+                "span.a-offscreen",
+                {"whole": "span.a-price-whole", "fraction": "span.a-price-fraction"}
+            ],
+            "link": ["h2 a"],
+        },
+        "goto_timeout": 90000,
+        "base_url": "https://www.amazon.com.br",
+        "min_title_length": 5,
+        "rate_limit": {"min_interval": 45, "jitter": 15},
+        "allow_urls": [],
+    },
+    {
+        "name": "Magazine Luiza",
+        "url": "https://www.magazineluiza.com.br/busca/{query}/?page={page}",
+        "query_separator": "+",
+        "query_lower": True,
+        # O link é o próprio cartão
+        "card": {
+            "card": 'a[data-testid="product-card-container"]',
+            "title": ['[data-testid="product-title"]'],
+            "price": ['[data-testid="price-value"]'],
+            "link": None,
+        },
+        "fast_path": True,
+        "goto_timeout": 90000,
+        "max_pages": 2,
+        # Delay entre páginas (importante para evitar bloqueio)
+        "page_delay": (4, 7),
+        "base_url": "https://www.magazineluiza.com.br",
+        "price_strip": ["ou "],
+        # Já pagina 2x dentro do mesmo job
+        "rate_limit": {"min_interval": 45, "jitter": 15},
+        "allow_urls": [],
+    },
+    {
+        "name": "Americanas",
+        "url": "https://www.americanas.com.br/busca/{query}",
+        "query_separator": "-",
+        "query_lower": True,
+        "card": {
+            "card": 'div[data-fs-custom-product-card="true"]',
+            "title": ['h3[class*="ProductCard_productName"]'],
+            # discountPrice = preço à vista/PIX; fallback para preço regular
+            "price": [
+                'span[class*="ProductCard_discountPrice"]',
+                'p[class*="ProductCard_productPrice"]'
+            ],
+            "link": ["a"],
+        },
+        "fast_path": True,
+        "goto_timeout": 90000,
+        "base_url": "https://www.americanas.com.br",
+        "strip_query": True,
+        "rate_limit": {"min_interval": 40, "jitter": 15},
+        "allow_urls": [],
+    },
+]
+
+SPECS_BY_NAME = {spec["name"]: spec for spec in STORE_SPECS}
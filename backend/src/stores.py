@@ -0,0 +1,55 @@
+"""
+Registro das lojas monitoradas.
+
+Centraliza a ordem de execução e a função de cada scraper para que os
+modos de orquestração (serial e concorrente) usem a mesma lista.
+"""
+
+from scrapers.engine import make_scraper
+from scrapers.specs import STORE_SPECS
+
+# Ordem de execução das lojas (nome exibido, função do scraper), gerada a
+# partir das definições declarativas de scrapers/specs.py
+SCRAPERS = [(spec["name"], make_scraper(spec)) for spec in STORE_SPECS]
+
+# Rate limit por loja (ver scheduler.TokenBucket):
+#   min_interval: segundos entre o início de duas buscas na mesma loja
+#   burst: buscas permitidas em sequência antes de aplicar o intervalo
+#   jitter: segundos aleatórios somados a cada espera (comportamento humanizado)
+DEFAULT_RATE_LIMIT = {"min_interval": 30, "burst": 1, "jitter": 10}
+
+RATE_LIMITS = {spec["name"]: spec.get("rate_limit", {}) for spec in STORE_SPECS}
+
+# Trechos de URL que cada loja precisa para renderizar os cartões e que, por
+# isso, nunca são bloqueados (ver browser_pool.block_resources). Imagens,
+# fontes, mídia e rastreadores são bloqueados em todas as outras requisições.
+RESOURCE_ALLOWLIST = {spec["name"]: spec.get("allow_urls", []) for spec in STORE_SPECS}
+
+def run_store(pool, store_name, scraper, query):
+    """
+    Executa um scraper em um contexto novo e isolado do navegador compartilhado.
+
+    O contexto só é aberto se o scraper precisar do navegador: buscas
+    resolvidas pelo fast path HTTP não pagam por ele.
+
+    Args:
+        pool (BrowserPool): Navegador da thread/processo atual
+        store_name (str): Nome da loja (chave de RESOURCE_ALLOWLIST)
+        scraper (callable): Função `scraper(query, context_factory=...)` da loja
+        query (str): Termo de busca
+
+    Returns:
+        list: Produtos encontrados
+    """
+    opened = []
+
+    def open_context():
+        context = pool.new_context(allow_urls=RESOURCE_ALLOWLIST.get(store_name))
+        opened.append(context)
+        return context
+
+    try:
+        return scraper(query, context_factory=open_context)
+    finally:
+        for context in opened:
+            context.close()
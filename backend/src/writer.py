@@ -0,0 +1,154 @@
+"""
+Gravação em Segundo Plano
+
+Os scrapers entregam os produtos ao ResultWriter assim que cada loja termina;
+uma thread dedicada agrupa os registros (por tamanho ou por tempo) e salva no
+Supabase enquanto a coleta continua. A fila é limitada: se o banco ficar para
+trás, quem produz espera em vez de acumular a varredura inteira em memória.
+
+Lotes que falham são repetidos com backoff exponencial e, se ainda assim não
+forem salvos, vão para WRITER_FAILED_PATH (JSONL) para reimportação.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from db import save_price_history
+
+WRITER_BATCH_SIZE = int(os.environ.get("WRITER_BATCH_SIZE", "200"))
+WRITER_FLUSH_INTERVAL = float(os.environ.get("WRITER_FLUSH_INTERVAL", "10"))
+WRITER_QUEUE_SIZE = int(os.environ.get("WRITER_QUEUE_SIZE", "5000"))
+WRITER_RETRIES = int(os.environ.get("WRITER_RETRIES", "3"))
+WRITER_FAILED_PATH = os.environ.get("WRITER_FAILED_PATH", "failed_batches.jsonl")
+
+_STOP = object()
+
+class ResultWriter:
+    """
+    Fila limitada + thread que salva os produtos em lotes.
+
+    Uso:
+        with ResultWriter() as writer:
+            writer.put(produtos)   # a cada loja concluída
+        # ao sair, o que restou na fila é salvo
+    """
+
+    def __init__(self, save=save_price_history, batch_size=WRITER_BATCH_SIZE,
+                 flush_interval=WRITER_FLUSH_INTERVAL, max_queue=WRITER_QUEUE_SIZE,
+                 retries=WRITER_RETRIES, backoff=2.0,
+                 failed_path=WRITER_FAILED_PATH, archive=None):
+        """
+        Args:
+            save (callable): Função que grava um lote (`save(lote, raise_errors=True)`);
+                se retornar False o lote conta como ignorado, não como salvo
+            batch_size (int): Registros por lote
+            flush_interval (float): Segundos máximos que um lote parcial espera
+            max_queue (int): Registros na fila antes de `put` bloquear
+            retries (int): Tentativas por lote
+            backoff (float): Base do backoff exponencial (segundos)
+            failed_path (str): JSONL com os lotes que não puderam ser salvos
+            archive (RunArchive, optional): Arquivo JSON Lines da execução;
+                recebe os registros já em `put`, antes de irem para a fila
+        """
+        self.save = save
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.failed_path = failed_path
+        self.archive = archive
+
+        self.received = 0
+        self.saved = 0
+        self.failed = 0
+        self.skipped = 0
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def put(self, records):
+        """Enfileira produtos (bloqueia enquanto a fila estiver cheia)."""
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            self.received += len(records)
+        if self.archive is not None:
+            self.archive.write(records)
+        for record in records:
+            self._queue.put(record)
+
+    def _run(self):
+        batch = []
+        deadline = None
+
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                break
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch):
+        for attempt in range(1, self.retries + 1):
+            try:
+                if self.save(batch, raise_errors=True) is False:
+                    # Sem Supabase configurado: nada foi gravado (só o arquivo da execução)
+                    if not self.skipped:
+                        print("[writer] Supabase não configurado, lotes não serão salvos no banco.")
+                    self.skipped += len(batch)
+                    return
+                self.saved += len(batch)
+                return
+            except Exception as e:
+                if attempt < self.retries:
+                    wait = self.backoff ** attempt
+                    print(f"[writer] Falha ao salvar lote de {len(batch)} ({e}), nova tentativa em {wait:.0f}s...")
+                    time.sleep(wait)
+                else:
+                    print(f"[writer] Lote de {len(batch)} não salvo após {self.retries} tentativas: {e}")
+
+        # Não perder os dados: guardar para reimportar depois
+        self.failed += len(batch)
+        with open(self.failed_path, "a", encoding="utf-8") as f:
+            for record in batch:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"[writer] Registros guardados em {self.failed_path}")
+
+    def close(self):
+        """Salva o que restou na fila e encerra a thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        print(f"[writer] {self.saved} registros salvos, {self.failed} com falha, "
+              f"{self.skipped} ignorados sem Supabase (de {self.received}).")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
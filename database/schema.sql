@@ -13,3 +13,160 @@ CREATE TABLE IF NOT EXISTS price_history (
 -- Índice para buscas mais rápidas por nome do produto e data
 CREATE INDEX IF NOT EXISTS idx_price_history_product_name ON price_history (product_name);
 CREATE INDEX IF NOT EXISTS idx_price_history_timestamp ON price_history (timestamp);
+
+-- Nome normalizado (gravado por db.save_price_history)
+ALTER TABLE price_history ADD COLUMN IF NOT EXISTS normalized_name TEXT;
+
+-- Catálogo canônico: um produto por chave normalizada
+CREATE TABLE IF NOT EXISTS products (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    normalized_name TEXT NOT NULL UNIQUE,
+    display_name TEXT NOT NULL,
+    category TEXT,
+    brand TEXT,
+    model TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Anúncios: cada (loja, nome original) aponta para um produto do catálogo
+CREATE TABLE IF NOT EXISTS listings (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    store TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    url TEXT,
+    product_id BIGINT NOT NULL REFERENCES products (id),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (store, product_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_listings_product_id ON listings (product_id);
+
+-- Cada registro de preço carrega os IDs do catálogo (agrupamentos viram joins por inteiro)
+ALTER TABLE price_history ADD COLUMN IF NOT EXISTS product_id BIGINT REFERENCES products (id);
+ALTER TABLE price_history ADD COLUMN IF NOT EXISTS listing_id BIGINT REFERENCES listings (id);
+
+CREATE INDEX IF NOT EXISTS idx_price_history_product_id ON price_history (product_id);
+CREATE INDEX IF NOT EXISTS idx_price_history_listing_id ON price_history (listing_id);
+
+-- Último preço de cada anúncio: price_history só recebe um ponto novo quando
+-- o preço muda; nas outras coletas apenas last_seen é atualizado
+CREATE TABLE IF NOT EXISTS price_latest (
+    store TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    normalized_name TEXT,
+    url TEXT,
+    price NUMERIC(10, 2) NOT NULL,
+    product_id BIGINT REFERENCES products (id),
+    listing_id BIGINT REFERENCES listings (id),
+    first_seen TIMESTAMPTZ DEFAULT NOW(),
+    last_seen TIMESTAMPTZ DEFAULT NOW(),
+    last_changed TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (store, product_name)
+);
+
+-- Execuções do scraper: cada coleta grava o run_id da execução em que foi vista
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    mode TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    products INTEGER,
+    started_at TIMESTAMPTZ DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_scrape_runs_status_started ON scrape_runs (status, started_at DESC);
+
+ALTER TABLE price_history ADD COLUMN IF NOT EXISTS run_id BIGINT REFERENCES scrape_runs (id);
+
+-- Histórico de um produto em uma loja, do mais recente ao mais antigo (modal de histórico)
+CREATE INDEX IF NOT EXISTS idx_price_history_normalized_store_ts
+    ON price_history (normalized_name, store, timestamp DESC);
+
+-- price_latest é o que o frontend lê: preço anterior e menor preço já visto
+-- (tendência e "menor preço" sem carregar o histórico) e a última execução
+ALTER TABLE price_latest ADD COLUMN IF NOT EXISTS previous_price NUMERIC(10, 2);
+ALTER TABLE price_latest ADD COLUMN IF NOT EXISTS min_price NUMERIC(10, 2);
+ALTER TABLE price_latest ADD COLUMN IF NOT EXISTS run_id BIGINT REFERENCES scrape_runs (id);
+
+-- Preenche price_latest a partir do histórico já existente (bancos criados
+-- antes desta tabela); anúncios que já estão em price_latest não mudam
+INSERT INTO price_latest (
+    store, product_name, normalized_name, url, price, product_id, listing_id,
+    first_seen, last_seen, last_changed, min_price, run_id
+)
+SELECT DISTINCT ON (store, product_name)
+    store, product_name, normalized_name, url, price, product_id, listing_id,
+    MIN(timestamp) OVER anuncio, timestamp, timestamp, MIN(price) OVER anuncio, run_id
+FROM price_history
+WHERE price IS NOT NULL
+WINDOW anuncio AS (PARTITION BY store, product_name)
+ORDER BY store, product_name, timestamp DESC
+ON CONFLICT (store, product_name) DO NOTHING;
+
+UPDATE price_latest SET min_price = price WHERE min_price IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_price_latest_run_id ON price_latest (run_id);
+CREATE INDEX IF NOT EXISTS idx_price_latest_last_seen ON price_latest (last_seen DESC);
+CREATE INDEX IF NOT EXISTS idx_price_latest_normalized_store ON price_latest (normalized_name, store);
+
+-- Agregados por dia e por semana (backend/src/rollups.py): gráficos e
+-- consultas de períodos longos leem estas tabelas em vez do histórico bruto
+CREATE TABLE IF NOT EXISTS price_daily (
+    normalized_name TEXT NOT NULL,
+    store TEXT NOT NULL,
+    period_start DATE NOT NULL,
+    min_price NUMERIC(10, 2) NOT NULL,
+    max_price NUMERIC(10, 2) NOT NULL,
+    mean_price NUMERIC(12, 4) NOT NULL,
+    last_price NUMERIC(10, 2) NOT NULL,
+    last_at TIMESTAMPTZ NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (normalized_name, store, period_start)
+);
+
+CREATE TABLE IF NOT EXISTS price_weekly (
+    normalized_name TEXT NOT NULL,
+    store TEXT NOT NULL,
+    period_start DATE NOT NULL,  -- segunda-feira
+    min_price NUMERIC(10, 2) NOT NULL,
+    max_price NUMERIC(10, 2) NOT NULL,
+    mean_price NUMERIC(12, 4) NOT NULL,
+    last_price NUMERIC(10, 2) NOT NULL,
+    last_at TIMESTAMPTZ NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (normalized_name, store, period_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_daily_period ON price_daily (period_start);
+CREATE INDEX IF NOT EXISTS idx_price_weekly_period ON price_weekly (period_start);
+
+-- Watermark de cada tabela de agregados (maior price_history.id já processado)
+CREATE TABLE IF NOT EXISTS rollup_state (
+    name TEXT PRIMARY KEY,
+    last_id BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Resumo analítico por produto e loja (backend/src/price_analytics.py):
+-- tendência, previsão e volatilidade calculadas no backend a cada coleta
+CREATE TABLE IF NOT EXISTS product_summary (
+    normalized_name TEXT NOT NULL,
+    store TEXT NOT NULL,
+    samples INTEGER NOT NULL,
+    first_seen TIMESTAMPTZ,
+    last_seen TIMESTAMPTZ,
+    current_price NUMERIC(10, 2) NOT NULL,
+    previous_price NUMERIC(10, 2),
+    min_price NUMERIC(10, 2) NOT NULL,
+    max_price NUMERIC(10, 2) NOT NULL,
+    mean_price NUMERIC(12, 4) NOT NULL,
+    is_lowest_price BOOLEAN NOT NULL DEFAULT FALSE,
+    trend TEXT,                -- rising, falling ou stable
+    slope_per_day NUMERIC(14, 6),
+    r_squared NUMERIC(6, 4),
+    predicted_price NUMERIC(10, 2),  -- daqui a 7 dias
+    change_percentage NUMERIC(10, 4),
+    volatility NUMERIC(10, 4), -- coeficiente de variação (%)
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (normalized_name, store)
+);
@@ -1,15 +1,39 @@
 import { useState, useEffect, useMemo } from 'react'
 import { supabase } from './lib/supabase'
+import { staticDataUrl, fetchStaticProducts, fetchStaticHistory } from './lib/staticData'
 import ProductCard from './components/ProductCard'
 import HistoryModal from './components/HistoryModal'
 import Filters from './components/Filters'
 import Dashboard from './components/Dashboard'
-import { calculateTrend, isLowestPrice, categorizeProduct, isKit } from './utils/priceAnalytics'
+import { trendFromPrevious, isLowestFromMin, categorizeProduct, isKit } from './utils/priceAnalytics'
+import { summaryToAnalysis } from './utils/analytics'
 import { LineChart, BarChart3, Package } from 'lucide-react'
 import './App.css'
 
+// Histórico carregado no modal: dias do gráfico, registros da tabela e
+// pontos brutos quando ainda não há agregados
+const DAILY_LIMIT = 365
+const RECENT_LIMIT = 5
+const HISTORY_LIMIT = 500
+
+// Linhas por página nas consultas (limite padrão da API do Supabase)
+const PAGE_SIZE = 1000
+
+// Todas as páginas de uma consulta; `buildQuery` precisa de uma ordem
+// estável (terminando na chave primária) para as páginas não pularem linhas
+async function fetchAllPages(buildQuery) {
+  const rows = []
+  for (let start = 0; ; start += PAGE_SIZE) {
+    const { data, error } = await buildQuery().range(start, start + PAGE_SIZE - 1)
+    if (error) return { data: rows, error }
+    rows.push(...data)
+    if (data.length < PAGE_SIZE) return { data: rows, error: null }
+  }
+}
+
 function App() {
   const [rawData, setRawData] = useState([])
+  const [summaries, setSummaries] = useState({})
   const [loading, setLoading] = useState(true)
   const [searchTerm, setSearchTerm] = useState('')
   const [selectedProductGroup, setSelectedProductGroup] = useState(null)
@@ -26,15 +50,45 @@ function App() {
   async function fetchProducts() {
     try {
       setLoading(true)
-      const { data, error } = await supabase
-        .from('price_history')
-        .select('*')
-        .order('timestamp', { ascending: false })
+
+      if (staticDataUrl) {
+        const { rows, summaries } = await fetchStaticProducts()
+        setRawData(rows)
+        setSummaries(summaries)
+        return
+      }
+
+      // Um registro por anúncio (último preço), mantido pelo scraper a cada
+      // execução: o carregamento cresce com o número de produtos, não com o histórico
+      // Junto com o resumo analítico calculado no backend (price_analytics.py)
+      const [{ data, error }, summary] = await Promise.all([
+        fetchAllPages(() => supabase
+          .from('price_latest')
+          .select('*')
+          .order('last_seen', { ascending: false })
+          .order('store')
+          .order('product_name')),
+        fetchAllPages(() => supabase
+          .from('product_summary')
+          .select('*')
+          .order('normalized_name')
+          .order('store'))
+      ])
 
       if (error) {
         console.error('Erro ao buscar produtos:', error)
       } else {
-        setRawData(data || [])
+        setRawData((data || []).map(item => ({ ...item, timestamp: item.last_seen })))
+      }
+
+      if (summary.error) {
+        console.error('Erro ao buscar resumo analítico:', summary.error)
+      } else {
+        const byKey = {}
+        for (const row of summary.data || []) {
+          byKey[`${row.store}-${row.normalized_name}`] = row
+        }
+        setSummaries(byKey)
       }
     } catch (e) {
       console.error('Erro inesperado:', e)
@@ -43,41 +97,97 @@ function App() {
     }
   }
 
-  // Agrupar produtos duplicados (mesmo nome e loja) E Calcular Analytics
+  // Agrupar anúncios do mesmo produto na mesma loja E Calcular Analytics
   const processedProducts = useMemo(() => {
     const groups = {}
 
     rawData.forEach(item => {
-      // Usar normalized_name se disponível, senão fallback para product_name
-      const productKey = item.normalized_name || item.product_name
+      // Usar o product_id do catálogo se disponível, senão fallback para
+      // normalized_name e, por último, product_name
+      const productKey = item.product_id ?? (item.normalized_name || item.product_name)
       const key = `${item.store}-${productKey}`
 
       if (!groups[key]) {
-        groups[key] = {
-          product: item, // Mantém o item mais recente
-          history: []
-        }
+        groups[key] = item // Mantém o anúncio visto mais recentemente
       }
-      groups[key].history.push(item)
     })
 
-    // Retornar array dos produtos mais recentes com campos extras
-    return Object.values(groups).map(g => {
-      const history = g.history;
-      const currentPrice = g.product.price;
+    return Object.values(groups).map(item => {
+      const summary = summaries[`${item.store}-${item.normalized_name}`]
+      // O resumo vale enquanto o preço não mudou depois do último cálculo
+      const summaryIsCurrent = summary && Math.abs(summary.current_price - item.price) <= 0.01
 
       return {
-        ...g.product,
-        fullHistory: history,
-        trend: calculateTrend(currentPrice, history),
-        isLowestPrice: isLowestPrice(currentPrice, history),
-        computedCategory: categorizeProduct(g.product.product_name),
-        isKit: isKit(g.product.product_name)
+        ...item,
+        trend: trendFromPrevious(item.price, item.previous_price),
+        isLowestPrice: summaryIsCurrent ? summary.is_lowest_price : isLowestFromMin(item.price, item.min_price),
+        analysis: summaryIsCurrent ? summaryToAnalysis(summary) : null,
+        computedCategory: categorizeProduct(item.product_name),
+        isKit: isKit(item.product_name)
       }
     })
-  }, [rawData])
+  }, [rawData, summaries])
 
+  // Histórico sob demanda, só do produto aberto no modal: o gráfico usa os
+  // agregados diários (price_daily) e a tabela os últimos registros brutos
+  // (índice price_history (normalized_name, store, timestamp DESC))
+  async function openHistory(product) {
+    setSelectedProductGroup({ product, history: null })
 
+    if (staticDataUrl) {
+      let history = []
+      try {
+        history = await fetchStaticHistory(product)
+      } catch (e) {
+        console.error('Erro ao buscar histórico:', e)
+      }
+      setSelectedProductGroup(current =>
+        current && current.product === product ? { product, history } : current
+      )
+      return
+    }
+
+    const rawQuery = (limit) => {
+      let query = supabase
+        .from('price_history')
+        .select('id, price, timestamp')
+        .eq('store', product.store)
+      query = product.normalized_name
+        ? query.eq('normalized_name', product.normalized_name)
+        : query.eq('product_name', product.product_name)
+      return query.order('timestamp', { ascending: false }).limit(limit)
+    }
+
+    let chartHistory = null
+    if (product.normalized_name) {
+      const { data, error } = await supabase
+        .from('price_daily')
+        .select('period_start, last_price')
+        .eq('normalized_name', product.normalized_name)
+        .eq('store', product.store)
+        .order('period_start', { ascending: false })
+        .limit(DAILY_LIMIT)
+
+      if (error) {
+        console.error('Erro ao buscar agregados diários:', error)
+      } else if (data && data.length > 0) {
+        chartHistory = data.map(day => ({ price: day.last_price, timestamp: `${day.period_start}T12:00:00Z` }))
+      }
+    }
+
+    // Sem agregados (rollups.py ainda não rodou): gráfico com os pontos brutos
+    const { data, error } = await rawQuery(chartHistory ? RECENT_LIMIT : HISTORY_LIMIT)
+    if (error) {
+      console.error('Erro ao buscar histórico:', error)
+    }
+
+    // Ignorar a resposta se o usuário já abriu outro produto
+    setSelectedProductGroup(current =>
+      current && current.product === product
+        ? { product, history: data || [], chartHistory }
+        : current
+    )
+  }
 
   const filteredProducts = useMemo(() => {
     return processedProducts.filter(item => {
@@ -154,7 +264,7 @@ function App() {
                       <ProductCard product={product} />
                       <button
                         className="history-btn"
-                        onClick={() => setSelectedProductGroup({ product, history: product.fullHistory })}
+                        onClick={() => openHistory(product)}
                         title="Ver Histórico"
                       >
                         <LineChart size={20} />
@@ -4,7 +4,7 @@ import './HistoryModal.css';
 import { X } from 'lucide-react';
 
 const HistoryModal = ({ productGroup, onClose }) => {
-    const { product, history } = productGroup;
+    const { product, history, chartHistory } = productGroup;
 
     return (
         <div className="modal-overlay" onClick={onClose}>
@@ -15,29 +15,35 @@ const HistoryModal = ({ productGroup, onClose }) => {
                 </div>
 
                 <div className="modal-body">
-                    <div className="chart-container">
-                        <PriceHistoryChart history={history} />
-                    </div>
+                    {history === null ? (
+                        <p>Carregando histórico...</p>
+                    ) : (
+                        <>
+                            <div className="chart-container">
+                                <PriceHistoryChart history={chartHistory || history} />
+                            </div>
 
-                    <div className="history-table">
-                        <h3>Últimos Registros</h3>
-                        <table>
-                            <thead>
-                                <tr>
-                                    <th>Data</th>
-                                    <th>Preço</th>
-                                </tr>
-                            </thead>
-                            <tbody>
-                                {history.slice().sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp)).slice(0, 5).map(item => (
-                                    <tr key={item.id}>
-                                        <td>{new Date(item.timestamp).toLocaleString('pt-BR')}</td>
-                                        <td>R$ {item.price.toFixed(2)}</td>
-                                    </tr>
-                                ))}
-                            </tbody>
-                        </table>
-                    </div>
+                            <div className="history-table">
+                                <h3>Últimos Registros</h3>
+                                <table>
+                                    <thead>
+                                        <tr>
+                                            <th>Data</th>
+                                            <th>Preço</th>
+                                        </tr>
+                                    </thead>
+                                    <tbody>
+                                        {history.slice().sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp)).slice(0, 5).map(item => (
+                                            <tr key={item.id}>
+                                                <td>{new Date(item.timestamp).toLocaleString('pt-BR')}</td>
+                                                <td>R$ {item.price.toFixed(2)}</td>
+                                            </tr>
+                                        ))}
+                                    </tbody>
+                                </table>
+                            </div>
+                        </>
+                    )}
                 </div>
             </div>
         </div>
@@ -1,11 +1,15 @@
 import React from 'react';
-import { ExternalLink } from 'lucide-react';
+import { ExternalLink, AlertCircle } from 'lucide-react';
 import './ProductCard.css';
 
 import TrendIndicator from './TrendIndicator';
+import { getRecommendation } from '../utils/analytics';
 
 const ProductCard = ({ product }) => {
-    const { product_name, price, store, url, trend, isLowestPrice, isKit } = product;
+    const { product_name, price, store, url, trend, isLowestPrice, isKit, analysis } = product;
+
+    // Recomendação só com o resumo do backend (product_summary) em dia
+    const recommendation = analysis ? getRecommendation(analysis) : null;
 
     // Formatar preço
     const formattedPrice = new Intl.NumberFormat('pt-BR', {
@@ -33,6 +37,12 @@ const ProductCard = ({ product }) => {
                     <span className="price-value">{formattedPrice}</span>
                     <TrendIndicator trend={trend} />
                 </div>
+                {recommendation && (
+                    <p className={`card-recommendation ${recommendation.color}`}>
+                        <AlertCircle size={14} />
+                        {recommendation.reason}
+                    </p>
+                )}
             </div>
             <div className="card-footer">
                 <a href={url} target="_blank" rel="noopener noreferrer" className="buy-button">
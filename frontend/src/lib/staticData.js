@@ -0,0 +1,60 @@
+// Leitura da exportação estática (backend/src/export_static.py) quando
+// VITE_STATIC_DATA_URL está configurada: alguns KB da CDN por visita em vez
+// de consultas ao Supabase
+
+export const staticDataUrl = import.meta.env.VITE_STATIC_DATA_URL?.replace(/\/$/, '')
+
+async function fetchJson(path, options) {
+  const response = await fetch(`${staticDataUrl}/${path}`, options)
+  if (!response.ok) throw new Error(`${path}: HTTP ${response.status}`)
+  return response.json()
+}
+
+// Com a versão .gz na exportação (manifest.encodings), busca ela: o Supabase
+// Storage a entrega como está (application/gzip) e o navegador descomprime;
+// um servidor que já envia Content-Encoding: gzip entrega o JSON pronto
+let useGzip = false
+
+async function fetchExportFile(path) {
+  if (!useGzip) return fetchJson(path)
+  const response = await fetch(`${staticDataUrl}/${path}.gz`)
+  if (!response.ok) throw new Error(`${path}.gz: HTTP ${response.status}`)
+  const bytes = new Uint8Array(await response.arrayBuffer())
+  if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+    return JSON.parse(new TextDecoder().decode(bytes))
+  }
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'))
+  return new Response(stream).json()
+}
+
+// Mesmo formato das linhas de price_latest + resumos no formato de product_summary
+export async function fetchStaticProducts() {
+  // O manifest muda a cada coleta; os arquivos de categoria têm hash no nome
+  // e uma categoria sem mudanças vem do cache do navegador
+  const manifest = await fetchJson('manifest.json', { cache: 'no-cache' })
+  useGzip = (manifest.encodings || []).includes('.gz') && typeof DecompressionStream !== 'undefined'
+  const shards = await Promise.all(
+    Object.values(manifest.categories).map(category => fetchExportFile(category.path))
+  )
+  const products = shards.flatMap(shard => shard.products)
+
+  const summaries = {}
+  products.forEach(item => {
+    if (item.summary) {
+      summaries[`${item.store}-${item.normalized_name}`] = item.summary
+    }
+  })
+
+  const rows = products
+    .map(item => ({ ...item, timestamp: item.last_seen }))
+    .sort((a, b) => new Date(b.last_seen) - new Date(a.last_seen))
+
+  return { rows, summaries }
+}
+
+// Agregados diários no formato { price, timestamp } do PriceHistoryChart
+export async function fetchStaticHistory(product) {
+  if (!product.history) return []
+  const { points } = await fetchExportFile(product.history)
+  return points.map(([day, lastPrice]) => ({ id: day, price: lastPrice, timestamp: `${day}T12:00:00Z` }))
+}
@@ -40,6 +40,21 @@ export function calculatePriceTrend(history) {
     };
 }
 
+// Mesmo formato de calculatePriceTrend a partir de uma linha de
+// product_summary (calculada no backend por price_analytics.py)
+export function summaryToAnalysis(summary) {
+    if (!summary || summary.predicted_price == null) return null;
+
+    return {
+        currentPrice: summary.current_price,
+        predictedPrice: summary.predicted_price,
+        trend: summary.trend,
+        changePercentage: summary.change_percentage,
+        confidence: Math.max(0, Math.min(100, summary.r_squared * 100)),
+        volatility: summary.volatility
+    };
+}
+
 export function calculateVolatility(prices) {
     if (prices.length < 2) return 0;
 
@@ -34,6 +34,23 @@ export function isLowestPrice(currentPrice, history) {
     return currentPrice <= minPrice;
 }
 
+// Versões para price_latest: a tabela já guarda o preço anterior e o menor
+// preço visto, então a listagem não precisa do histórico completo
+export function trendFromPrevious(currentPrice, previousPrice) {
+    if (previousPrice == null) return null;
+
+    const diff = currentPrice - previousPrice;
+    if (Math.abs(diff) <= 0.01) return 'stable';
+
+    const percentage = (diff / previousPrice) * 100;
+    return { direction: diff > 0 ? 'up' : 'down', percentage: Math.abs(percentage) };
+}
+
+export function isLowestFromMin(currentPrice, minPrice) {
+    if (minPrice == null) return true;
+    return currentPrice <= minPrice + 0.01;
+}
+
 export function categorizeProduct(productName) {
     if (!productName) return 'Outros';
     const name = productName.toLowerCase();